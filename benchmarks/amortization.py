@@ -0,0 +1,62 @@
+# Speed of the vectorized amortization engine, compared to a straightforward
+# period-by-period loop, and of the scenario grid. Its correctness against
+# that loop is covered by tests/test_finance.py.
+#
+#   python -m benchmarks.amortization [--loans 10000] [--years 40]
+import argparse
+import statistics
+import time
+import numpy as np
+from finance import PERIODS_PER_YEAR, ScenarioCache, amortization_schedule, scenario_grid
+
+# Reference schedule of a single loan, one period at a time
+def reference_schedule(principal, annual_rate, years):
+    r = annual_rate / 100 / PERIODS_PER_YEAR
+    n = round(years * PERIODS_PER_YEAR)
+    payment = principal / n if r == 0 else principal * r / (1 - (1 + r) ** -n)
+    balance, rows = principal, []
+    for period in range(n):
+        interest = balance * r
+        repaid = balance if period == n - 1 else payment - interest
+        balance -= repaid
+        rows.append((interest, repaid, balance))
+    return payment, np.array(rows).T
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized amortization engine")
+    parser.add_argument("--loans", type=int, default=10_000)
+    parser.add_argument("--years", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    principal = rng.uniform(50_000, 1_000_000, args.loans)
+    rate = rng.uniform(0.5, 8, args.loans)
+    samples = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        amortization_schedule(principal, rate, args.years)
+        samples.append(time.perf_counter() - start)
+    vectorized = statistics.median(samples)
+
+    start = time.perf_counter()
+    sample = min(args.loans, 100)
+    for i in range(sample):
+        reference_schedule(principal[i], rate[i], args.years)
+    loop = (time.perf_counter() - start) / sample * args.loans
+    print(f"{args.loans} loans x {args.years} years: {vectorized * 1000:.1f} ms vectorized, "
+          f"~{loop * 1000:.0f} ms with a per-period loop (extrapolated)")
+
+    # Scenario grid with Sondertilgung and refinancing: cold, then with one more loan term
+    cache = ScenarioCache()
+    down_payments = np.arange(0, 200_001, 10_000)
+    rates = np.round(np.arange(1, 6.01, 0.05), 2)
+    terms = [10, 15, 20, 25, 30, 35]
+    for label, grid_terms in (("cold", terms), ("one term added", terms + [40]), ("unchanged", terms + [40])):
+        start = time.perf_counter()
+        grid = scenario_grid(500_000, down_payments, rates, grid_terms, 5.0, 10, 5.0, cache=cache)
+        print(f"scenario grid {label}: {len(grid)} cells in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Time-to-first-token and total latency of Bot.ask() vs Bot.stream()/astream()
+# against the offline FakeChatModel, and of ask() answered by the response cache.
+#
+#   python -m benchmarks.chat_latency [--runs 5] [--tokens 60]
+import argparse
+import asyncio
+import statistics
+import time
+import bot
+from benchmarks.fake_llm import FakeChatModel
+from embeddings import HashingEmbedder
+from listings import ListingStore, generate_mock_data
+from response_cache import ResponseCache
+from retrieval import RetrievalIndex
+
+def measure_ask(chatbot, prompt):
+    start = time.perf_counter()
+    chatbot.ask(prompt)
+    total = time.perf_counter() - start
+    # Nothing can be shown before the whole answer is there
+    return total, total
+
+def measure_stream(chatbot, prompt):
+    start = time.perf_counter()
+    first = None
+    for _ in chatbot.stream(prompt):
+        if first is None:
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+def measure_astream(chatbot, prompt):
+    async def run():
+        start = time.perf_counter()
+        first = None
+        async for _ in chatbot.astream(prompt):
+            if first is None:
+                first = time.perf_counter() - start
+        return first, time.perf_counter() - start
+    return asyncio.run(run())
+
+def main():
+    parser = argparse.ArgumentParser(description="TTFT and total latency of Bot.ask() vs streaming")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tokens", type=int, default=60)
+    parser.add_argument("--first-token-delay", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    llm = FakeChatModel(
+        response=" ".join(["token"] * args.tokens),
+        first_token_delay=args.first_token_delay,
+        token_delay=args.token_delay,
+    )
+    # Retrieval over an in-memory store, so the benchmark never creates or
+    # seeds the app's database
+    index = RetrievalIndex()
+    index.sync(ListingStore(generate_mock_data()))
+    chatbot = bot.Bot(llm=llm, cache=False, retriever=index.search)
+    print(f"{'mode':<8} {'ttft p50 (ms)':>14} {'total p50 (ms)':>15}")
+    for name, measure in [("ask", measure_ask), ("stream", measure_stream), ("astream", measure_astream)]:
+        samples = [measure(chatbot, "What deposit can my landlord ask for?") for _ in range(args.runs)]
+        ttft = statistics.median(s[0] for s in samples) * 1000
+        total = statistics.median(s[1] for s in samples) * 1000
+        print(f"{name:<8} {ttft:>14.1f} {total:>15.1f}")
+
+    # Fresh conversations asking the same question in different words
+    cache = ResponseCache(embedder=HashingEmbedder())
+    client = bot.LLMClient(llm=llm)
+    prompts = ["What deposit can my landlord ask for?", "what deposit can my landlord ask for",
+               "What deposit can my landlord ask for, please?"]
+    samples = [measure_ask(bot.Bot(client=client, cache=cache, retriever=index.search), prompts[run % len(prompts)]) for run in range(args.runs + 1)]
+    total = statistics.median(s[1] for s in samples[1:]) * 1000
+    print(f"{'cached':<8} {total:>14.1f} {total:>15.1f}")
+    stats = cache.stats()
+    print(f"cache: {stats['exact_hits']} exact / {stats['semantic_hits']} similar hits, "
+          f"{stats['misses']} misses, hit rate {stats['hit_rate']:.0%}, saved {stats['saved_seconds']:.2f}s")
+
+if __name__ == "__main__":
+    main()
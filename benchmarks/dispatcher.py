@@ -0,0 +1,58 @@
+# Behaviour of the LLM dispatcher against the local fake OpenAI server:
+# concurrency limit and queue depth under a burst, coalescing of identical
+# prompts, retries on upstream errors and deadlines on a slow upstream.
+#
+#   python -m benchmarks.dispatcher [--callers 32] [--concurrency 8]
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tenacity import wait_random_exponential
+import bot
+from benchmarks.fake_openai_server import FakeOpenAIServer
+from dispatcher import LLMDispatcher
+
+# Run one question per caller thread, like concurrent Streamlit sessions.
+# Returns (wall seconds, answers, errors).
+def burst(client, prompts):
+    def ask(prompt):
+        try:
+            return client.invoke({"history": [], "housing_context": "", "knowledge": "", "user": "student",
+                                  "output_language": "English", "input": prompt}).content
+        except Exception as error:
+            return error
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(prompts)) as pool:
+        results = list(pool.map(ask, prompts))
+    errors = [result for result in results if isinstance(result, Exception)]
+    return time.perf_counter() - start, len(results) - len(errors), errors
+
+def scenario(name, args, prompts, latency=None, failure_rate=0.0, deadline=30.0):
+    server = FakeOpenAIServer(latency=args.latency if latency is None else latency, failure_rate=failure_rate).start()
+    dispatcher = LLMDispatcher(max_concurrency=args.concurrency, deadline=deadline,
+                               wait=wait_random_exponential(multiplier=0.05, max=0.5))
+    client = bot.LLMClient(key="fake", base_url=server.base_url, dispatcher=dispatcher)
+    wall, answers, errors = burst(client, prompts)
+    server.stop()
+    stats = dispatcher.stats()
+    print(f"{name:<10} {len(prompts):>7} {answers:>7} {len(errors):>6} {server.requests:>9} {wall:>8.2f} "
+          f"{stats['max_queue_depth']:>9} {stats['coalesced']:>9} {stats['retries']:>7} {stats['timeouts']:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM dispatcher against a local fake server")
+    parser.add_argument("--callers", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    distinct = [f"Question {i} about renting in Munich" for i in range(args.callers)]
+    print(f"{'scenario':<10} {'callers':>7} {'answers':>7} {'errors':>6} {'upstream':>9} {'wall (s)':>8} "
+          f"{'max queue':>9} {'coalesced':>9} {'retries':>7} {'timeouts':>8}")
+    # Wall time should be about callers / concurrency * latency
+    scenario("burst", args, distinct)
+    scenario("identical", args, ["How much deposit can my landlord ask for?"] * args.callers)
+    scenario("flaky", args, distinct, failure_rate=0.3)
+    # Callers that cannot get a slot before the deadline fail fast instead of piling up
+    scenario("slow", args, distinct, latency=2.0, deadline=3.0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import asyncio
+import time
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Offline stand-in for ChatOpenAI with a configurable latency profile:
+# first_token_delay seconds before the first token, token_delay per token after it.
+class FakeChatModel(BaseChatModel):
+    response: str = "A typical rental deposit in Germany is at most three months of cold rent."
+    first_token_delay: float = 0.2
+    token_delay: float = 0.01
+    calls: int = 0
+
+    @property
+    def _llm_type(self):
+        return "fake-chat"
+
+    def _tokens(self):
+        words = self.response.split(" ")
+        return [word + " " for word in words[:-1]] + words[-1:]
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        tokens = self._tokens()
+        time.sleep(self.first_token_delay + self.token_delay * (len(tokens) - 1))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        for i, token in enumerate(self._tokens()):
+            time.sleep(self.first_token_delay if i == 0 else self.token_delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        tokens = self._tokens()
+        await asyncio.sleep(self.first_token_delay + self.token_delay * (len(tokens) - 1))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.response))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        for i, token in enumerate(self._tokens()):
+            await asyncio.sleep(self.first_token_delay if i == 0 else self.token_delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
@@ -0,0 +1,92 @@
+# Local stand-in for the OpenAI chat completions endpoint, for exercising the
+# real HTTP path (ChatOpenAI, httpx pool, dispatcher) offline.
+# Answers after `latency` seconds; a `failure_rate` share of requests fails
+# with a 500 or 429 instead. Streaming requests get server-sent events.
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeOpenAIServer():
+    def __init__(self, response="A typical rental deposit in Germany is at most three months of cold rent.",
+                 latency=0.2, token_delay=0.0, failure_rate=0.0, seed=0):
+        self.response = response
+        self.latency = latency
+        self.token_delay = token_delay
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # Status code for the next request: 200, or an error to provoke a retry
+    def _next_status(self):
+        with self._lock:
+            self.requests += 1
+            if self._random.random() < self.failure_rate:
+                self.failures += 1
+                return self._random.choice([500, 429])
+            return 200
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _json(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                status = server._next_status()
+                time.sleep(server.latency)
+                if status != 200:
+                    return self._json(status, {"error": {"message": "fake upstream error", "type": "server_error"}})
+                model = request.get("model", "fake")
+                if not request.get("stream"):
+                    return self._json(200, {
+                        "id": "fake", "object": "chat.completion", "created": int(time.time()), "model": model,
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": server.response}, "finish_reason": "stop"}],
+                        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                    })
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                words = server.response.split(" ")
+                tokens = [word + " " for word in words[:-1]] + words[-1:]
+                for i, token in enumerate(tokens):
+                    if i:
+                        time.sleep(server.token_delay)
+                    chunk = {
+                        "id": "fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                        "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+        return Handler
@@ -0,0 +1,28 @@
+# Synthetic listings for load tests, streamed to Parquet chunk by chunk so
+# even 10M rows never have to fit in memory at once. The same seed, row
+# count and chunk size always produce the same file.
+#
+#   python -m benchmarks.generate_listings --rows 1000000 --out listings.parquet [--seed 0]
+#
+# Read it back with listings.read_listings_parquet(path).
+import argparse
+import os
+import time
+from listings import GENERATE_CHUNK_SIZE, MOCK_DATA_SEED, write_listings_parquet
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic listings to a Parquet file")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--out", default="listings.parquet")
+    parser.add_argument("--seed", type=int, default=MOCK_DATA_SEED)
+    parser.add_argument("--chunk-size", type=int, default=GENERATE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = write_listings_parquet(args.out, args.rows, args.chunk_size, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"{rows:,} listings written to {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB) "
+          f"in {elapsed:.1f} s, {rows / elapsed:,.0f} rows/s")
+
+if __name__ == "__main__":
+    main()
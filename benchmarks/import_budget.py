@@ -0,0 +1,106 @@
+# Import-time budget of the app's entry points.
+# Every target runs in a fresh interpreter with -X importtime; the report
+# shows the heaviest packages it loaded, its import time and peak RSS, and
+# fails when a target goes over its time budget or loads a module that is
+# meant to be imported lazily.
+#
+#   python -m benchmarks.import_budget [--runs 3] [--top 10]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name: (code run in the fresh interpreter, import budget in ms, packages it must not load)
+TARGETS = {
+    # A cold rerun of the Home page, which is where every session starts
+    "app home page": (
+        "import runpy; runpy.run_path('app.py', run_name='__main__')",
+        2500,
+        ("langchain", "langchain_core", "langchain_openai", "openai", "httpx", "folium", "streamlit_folium",
+         "sklearn", "matplotlib", "scipy", "altair", "pandas", "sqlalchemy"),
+    ),
+    # The assistant module itself; the model stack comes with the first client
+    "bot": (
+        "import bot",
+        2000,
+        ("langchain", "langchain_core", "langchain_openai", "openai", "httpx", "dotenv", "sklearn", "matplotlib", "folium"),
+    ),
+    "listings": (
+        "import listings, listing_query",
+        1500,
+        ("scipy", "langchain_core", "openai", "folium", "sklearn", "matplotlib"),
+    ),
+    "storage": (
+        "import storage",
+        800,
+        ("pandas", "langchain_core", "openai"),
+    ),
+}
+
+# Parse -X importtime output into {module: (self us, cumulative us)} and the
+# time spent in each top-level package's own modules, in us
+def parse_importtime(stderr):
+    modules, packages = {}, defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        modules[module] = (int(self_us), int(cumulative_us))
+        packages[module.split(".")[0]] += int(self_us)
+    return modules, dict(packages)
+
+# Run code in a fresh interpreter; returns (modules, package times, peak RSS in MB)
+def profile(code):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    env.setdefault("OPEN_AI_KEY", "unused")
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    stderr = process.stderr.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{code!r} failed:\n{stderr[-2000:]}")
+    modules, packages = parse_importtime(stderr)
+    return modules, packages, usage.ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget of the app's entry points")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per target; the median is reported")
+    parser.add_argument("--top", type=int, default=10, help="heaviest packages listed per target")
+    parser.add_argument("targets", nargs="*", help=f"any of: {', '.join(TARGETS)} (default: all)")
+    args = parser.parse_args()
+    unknown = set(args.targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+
+    failures = []
+    for name in args.targets or TARGETS:
+        code, budget_ms, forbidden = TARGETS[name]
+        runs = [profile(code) for _ in range(args.runs)]
+        total_ms = statistics.median(sum(packages.values()) for _, packages, _ in runs) / 1000
+        rss = statistics.median(rss for _, _, rss in runs)
+        modules, packages, _ = runs[-1]
+
+        print(f"{name}: {total_ms:.0f} ms importing (budget {budget_ms} ms), peak RSS {rss:.0f} MB, {len(modules)} modules")
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+        if total_ms > budget_ms:
+            failures.append(f"{name}: {total_ms:.0f} ms is over the {budget_ms} ms budget")
+        loaded = sorted(package for package in forbidden if package in modules)
+        if loaded:
+            failures.append(f"{name}: imports {', '.join(loaded)} eagerly")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
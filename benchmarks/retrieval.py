@@ -0,0 +1,83 @@
+# Latency and recall@k of the assistant's retrieval index (BM25, vector and
+# hybrid ranking), and the cost of indexing new listings incrementally
+# compared to a rebuild. Runs offline with the hashing embedder.
+#
+#   python -m benchmarks.retrieval [--queries 200] [--k 4]
+import argparse
+import statistics
+import time
+import numpy as np
+from listings import ListingStore, generate_mock_data
+from retrieval import RetrievalIndex
+
+# Reworded FAQ and guide questions and the document each should find
+KNOWLEDGE_QUERIES = [
+    ("What can I use this site for?", ('faq', "What is this platform for?")),
+    ("Is the platform only for students or also for families?", ('faq', "Who can use this platform?")),
+    ("Explain what a mortgage loan is", ('faq', "What is a mortgage?")),
+    ("Will the bank charge me if I pay off my loan early?", ('faq', "What is 'Vorfälligkeitsentschädigung'?")),
+    ("Where can I change my profile details?", ('faq', "How do I edit my profile?")),
+    ("How much deposit can a landlord ask for in Germany?", ('guide', "Rental deposit")),
+    ("How much income do I need to get a house?", ('guide', "House assessment")),
+    ("How do I calculate my monthly mortgage payment?", ('guide', "Mortgage calculator")),
+    ("I want to list my flat for rent", ('guide', "Offering a house")),
+    ("Which districts have the most houses on the map?", ('guide', "Location Visualizer")),
+    ("Shared flat for a student with a free room", ('guide', "Step-by-Step Guide for students")),
+    ("We are a family looking for a place near schools", ('guide', "Step-by-Step Guide for families")),
+]
+
+# A listing query a user might type, and the listing it describes
+def listing_queries(frame, count, rng):
+    rows = frame.iloc[rng.choice(len(frame), size=min(count, len(frame)), replace=False)]
+    return [(f"{house.type} in {house.region} for {house.price} euros with {house.size} m2", ('listing', int(house.id)))
+            for house in rows.itertuples(index=False)]
+
+def evaluate(index, queries, k, method):
+    hits, latencies = 0, []
+    for query, target in queries:
+        start = time.perf_counter()
+        positions = index.rank(query, k, method)
+        latencies.append(time.perf_counter() - start)
+        hits += target in [index.sources[position] for position in positions]
+    latencies.sort()
+    return hits / len(queries), statistics.median(latencies) * 1000, latencies[int(0.95 * (len(latencies) - 1))] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieval index latency and recall")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--houses-per-district", type=int, default=40)
+    parser.add_argument("--added", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    store = ListingStore(generate_mock_data(args.houses_per_district, seed=args.seed))
+
+    start = time.perf_counter()
+    index = RetrievalIndex()
+    index.sync(store)
+    print(f"built index over {len(index)} documents in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # Incremental indexing of offered listings vs. building from scratch
+    for house in store.frame().sample(args.added, replace=True, random_state=args.seed).to_dict('records'):
+        store.add_listing(house)
+    start = time.perf_counter()
+    index.sync(store)
+    incremental = time.perf_counter() - start
+    start = time.perf_counter()
+    RetrievalIndex().sync(store)
+    rebuild = time.perf_counter() - start
+    print(f"indexing {args.added} new listings: {incremental * 1000:.1f} ms incremental, {rebuild * 1000:.1f} ms rebuild")
+
+    # Only the latest max_listings listings are searchable
+    searchable = store.frame().iloc[-index.max_listings:]
+    workloads = [("knowledge", KNOWLEDGE_QUERIES), ("listings", listing_queries(searchable, args.queries, rng))]
+    print(f"{'queries':<10} {'method':<7} {f'recall@{args.k}':>9} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for name, queries in workloads:
+        for method in ("bm25", "vector", "hybrid"):
+            recall, p50, p95 = evaluate(index, queries, args.k, method)
+            print(f"{name:<10} {method:<7} {recall:>9.2f} {p50:>9.2f} {p95:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# Benchmarks of the app's hot paths, without Streamlit and without network:
+# the guide-flow filters, district counts and map markers of the location
+# visualizer at several store sizes, the mortgage math of the financial
+# tools, the smart-recommendations matching and Bot.ask() against an
+# instant fake model. Data is generated from fixed seeds, so runs on the
+# same machine are comparable.
+#
+#   python -m benchmarks.suite [--sizes 1000,100000,1000000] [--filter guide] [--out results.json]
+#   python -m benchmarks.suite --baseline results.json      # run, then fail on regressions
+#   python -m benchmarks.suite --compare old.json new.json  # compare two saved runs
+#
+# Exits with status 1 when a case's median got slower than the baseline by
+# more than --threshold (and by more than --min-delta-ms).
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+import numpy as np
+
+# Listing store sizes the listing, count and map cases run at
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+# Default regression threshold: relative slowdown of the median
+REGRESSION_THRESHOLD = 0.25
+
+# Slowdowns below this many milliseconds are treated as noise
+MIN_DELTA_MS = 0.05
+
+# A benchmark case: setup() runs once, untimed, and returns the argument
+# passed to every timed call of run()
+class Case():
+    def __init__(self, name, setup, run, **params):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.params = params
+
+_stores = {}
+
+# Listing store with count synthetic listings and its indexes built
+def listing_store(count):
+    if count not in _stores:
+        from listings import ListingStore, generate_listings
+        store = ListingStore(generate_listings(count, seed=0))
+        store.index()
+        _stores[count] = store
+    return _stores[count]
+
+# The queries behind "Find Matches" of the three guide flows, built by the
+# flows' own query functions from their default inputs
+def guide_queries():
+    from listings import GENDERS
+    from views import guide
+    return {
+        "professional": guide.professional_query("Rent", *guide.PROFESSIONAL_PRICE_DEFAULTS["Rent"], *guide.PROFESSIONAL_SIZE_DEFAULT),
+        "student_shared": guide.shared_housing_query(guide.SHARED_HOUSING_PRICE_DEFAULT, GENDERS[0], True, guide.SHARED_HOUSING_PEOPLE_DEFAULT),
+        "family": guide.family_query("Sale", *guide.FAMILY_PRICE_DEFAULT, *guide.FAMILY_SIZE_DEFAULT, True, True),
+    }
+
+# Location visualizer query with its default preferences
+def visualizer_query(region=None):
+    from views import location
+    return location.preference_query(location.DEFAULT_PREFERENCES, region)
+
+def listing_cases(sizes):
+    cases = []
+    for count in sizes:
+        for flow in guide_queries():
+            # Uncached filtering plus the first page of results, as render_matches() shows it
+            cases.append(Case(
+                f"guide_filter/{flow}/{count}",
+                lambda count=count, flow=flow: (listing_store(count).index(), guide_queries()[flow]),
+                lambda args: args[1].run(args[0]).to_frame(0, 10),
+                listings=count,
+            ))
+        cases.append(Case(
+            f"district_counts/{count}",
+            lambda count=count: (listing_store(count).index(), visualizer_query()),
+            lambda args: args[1].run(args[0]).to_frame()['region'].value_counts(),
+            listings=count,
+        ))
+        cases.append(Case(
+            f"map_count_layer/{count}",
+            lambda count=count: visualizer_query().run(listing_store(count).index()).to_frame()['region'].value_counts(),
+            lambda counts: _maps().district_count_layer(counts),
+            listings=count,
+        ))
+        # Drill-down into the district with the most listings, at the default zoom
+        cases.append(Case(
+            f"map_house_layer/{count}",
+            lambda count=count: visualizer_query("Ramersdorf-Perlach").run(listing_store(count).index()).to_frame(),
+            lambda houses: _maps().district_house_layer(houses, _maps().DISTRICT_ZOOM),
+            listings=count,
+        ))
+    return cases
+
+def _maps():
+    import maps
+    return maps
+
+def finance_cases():
+    import finance
+    import charts
+
+    def loans(count):
+        rng = np.random.default_rng(0)
+        return rng.uniform(50_000, 1_000_000, count), rng.uniform(0.5, 8, count)
+
+    return [
+        Case("finance/monthly_payment", lambda: None, lambda _: float(finance.annuity_payment(100_000, 3.0, 20))),
+        Case("finance/amortization/10000x30y", lambda: loans(10_000), lambda args: finance.amortization_schedule(args[0], args[1], 30), loans=10_000),
+        # Uncached: the chart specs are lru_cached in the app
+        Case("finance/payment_breakdown_chart", lambda: None, lambda _: charts.payment_breakdown_chart.__wrapped__(100_000.0, 3.0, 20.0)),
+        Case(
+            "finance/scenario_grid_cold",
+            lambda: (np.arange(0, 300_001, 25_000), np.round(np.arange(2.0, 5.01, 0.25), 2), [15, 20, 25, 30]),
+            lambda args: finance.scenario_grid(500_000, *args, 5.0, 10, 4.0, cache=finance.ScenarioCache()),
+        ),
+    ]
+
+def recommendation_cases():
+    import pandas as pd
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    def profiles(count):
+        rng = np.random.default_rng(0)
+        return pd.DataFrame(rng.integers(0, 2, (count, 3)), columns=["Quiet", "Social", "Pets"])
+
+    cases = []
+    for count in (3, 100_000):
+        cases.append(Case(
+            f"recommendations/cosine_similarity/{count}",
+            lambda count=count: profiles(count),
+            lambda preferences: cosine_similarity([[1, 0, 1]], preferences.values)[0].argmax(),
+            profiles=count,
+        ))
+    return cases
+
+def chat_cases():
+    import bot
+    from benchmarks.fake_llm import FakeChatModel
+    from retrieval import RetrievalIndex
+
+    # One client with an instant model, so only our own overhead is timed:
+    # retrieval, prompt and history building, the dispatcher and memory
+    def client():
+        index = RetrievalIndex()
+        index.sync(listing_store(1_000))
+        return bot.LLMClient(llm=FakeChatModel(first_token_delay=0.0, token_delay=0.0)), index.search
+
+    def ask(args):
+        return bot.Bot(client=args[0], cache=False, retriever=args[1]).ask("What deposit can my landlord ask for?")
+
+    def follow_up(args):
+        chatbot = bot.Bot(client=args[0], cache=False, retriever=args[1])
+        for turn in range(10):
+            chatbot.ask(f"Question {turn} about flats in Maxvorstadt")
+        return chatbot
+
+    return [
+        Case("chat/bot_ask", client, ask),
+        Case("chat/bot_ask_10_turns", client, follow_up, turns=10),
+    ]
+
+def all_cases(sizes):
+    return listing_cases(sizes) + finance_cases() + recommendation_cases() + chat_cases()
+
+# Time run(setup()) until both min_runs calls and min_time seconds are
+# reached (at most max_runs calls), after one warm-up call
+def measure(case, min_runs, min_time, max_runs):
+    args = case.setup()
+    case.run(args)
+    samples, started = [], time.perf_counter()
+    while len(samples) < max_runs and (len(samples) < min_runs or time.perf_counter() - started < min_time):
+        start = time.perf_counter()
+        case.run(args)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[int(0.95 * (len(samples) - 1))],
+        "min_ms": samples[0],
+        "mean_ms": statistics.fmean(samples),
+        "runs": len(samples),
+        "params": case.params,
+    }
+
+def environment():
+    import pandas as pd
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+# Cases of current that are slower than in baseline by more than the
+# threshold, as (name, baseline ms, current ms) rows; prints the comparison
+def compare(baseline, current, threshold=REGRESSION_THRESHOLD, min_delta_ms=MIN_DELTA_MS):
+    regressions = []
+    print(f"{'case':<48} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<48} {'-':>10} {result['median_ms']:>10.3f} {'new':>8}")
+            continue
+        old, new = before["median_ms"], result["median_ms"]
+        change = new / old - 1 if old else 0.0
+        regressed = change > threshold and new - old > min_delta_ms
+        print(f"{name:<48} {old:>10.3f} {new:>10.3f} {change:>+8.1%}{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append((name, old, new))
+    return regressions
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the listing, map, finance and chat hot paths")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma separated listing store sizes")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds of timed calls per case at least")
+    parser.add_argument("--max-runs", type=int, default=10_000)
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results with this JSON file and fail on regressions")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="only compare two result files")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="allowed relative slowdown of a median")
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    if args.compare:
+        baseline, current = (load(path) for path in args.compare)
+    else:
+        sizes = [int(size) for size in args.sizes.split(",") if size]
+        current = {"environment": environment(), "results": {}}
+        for case in all_cases(sizes):
+            if args.filter in case.name:
+                result = measure(case, args.min_runs, args.min_time, args.max_runs)
+                current["results"][case.name] = result
+                print(f"{case.name:<48} {result['median_ms']:>10.3f} ms median, p95 {result['p95_ms']:.3f} ms, {result['runs']} runs")
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(current, f, indent=2)
+        baseline = load(args.baseline) if args.baseline else None
+
+    if baseline is not None:
+        regressions = compare(baseline, current, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,218 @@
-from dotenv import load_dotenv
+import functools
 import os
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
-from langchain.prompts import MessagesPlaceholder
-from langchain.chains import create_retrieval_chain
-from langchain.chains import create_history_aware_retriever 
-from langchain_core.prompts import ChatPromptTemplate
+import threading
+import time
+from chat_context import describe_profile
+from dispatcher import MAX_CONCURRENT_REQUESTS, get_dispatcher
+from memory import SUMMARY_WORDS, ConversationMemory
+from metrics import timed, timer
+from response_cache import get_response_cache
+from retrieval import retrieve
 
+# LangChain, the OpenAI SDK and httpx are imported when the first client is
+# created, not with this module: pages that never ask the assistant
+# anything do not pay for them.
 
-load_dotenv(".env")
-key = os.environ["OPEN_AI_KEY"]
+# Environment variable holding the OpenAI API key
+API_KEY_ENV = "OPEN_AI_KEY"
 
-class Bot():
-    def __init__(self, model = "gpt-4o", key = key):
-        self.contextualize_q_system_prompt = (
-        "You are a helpful AI assistant that consults user on housing options: {housing_context} depending on the user profile {user}."
-        "Given a chat history {history} and the latest user question "
-        "which might reference context in the chat history, "
-        "answer the user in the language {output_language}, in the most decisive way "
-        "and dont redirect to others. Take the responsibility."
-        "Without the chat history. Do NOT answer the question, "
-        )
-
-        self.history = []
-        self.llm = ChatOpenAI(model=model, api_key=key)
-        self.instruct_prompt = ChatPromptTemplate.from_messages(
-        [("system", self.contextualize_q_system_prompt),
+# Connection pool shared by all sessions
+HTTP_KEEPALIVE_EXPIRY = 120
+HTTP_TIMEOUT = 60.0
+HTTP_CONNECT_TIMEOUT = 10.0
+
+contextualize_q_system_prompt = (
+    "You are a helpful AI assistant that consults user on housing options: {housing_context} depending on the user profile {user}."
+    "Use this background information where it is relevant: {knowledge}\n"
+    "Given the chat history and the latest user question "
+    "which might reference context in the chat history, "
+    "answer the user in the language {output_language}, in the most decisive way "
+    "and dont redirect to others. Take the responsibility."
+    "Without the chat history. Do NOT answer the question, "
+)
+
+summary_system_prompt = (
+    "Summarize the conversation between a user and a housing assistant in at most {words} words. "
+    "Keep the facts the user shared about themselves and the housing options discussed. "
+    "Start from the summary so far: {summary}"
+)
+
+# API key from the environment (or .env), read when a client is created
+def api_key():
+    from dotenv import load_dotenv
+    load_dotenv(".env")
+    return os.environ[API_KEY_ENV]
+
+@functools.lru_cache(maxsize=None)
+def instruct_prompt():
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+    return ChatPromptTemplate.from_messages(
+        [("system", contextualize_q_system_prompt),
+            MessagesPlaceholder("history"),
             ("human", "{input}"),
         ])
-        
-        self.chain = self.instruct_prompt | self.llm
-        
-        
+
+@functools.lru_cache(maxsize=None)
+def summary_prompt():
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+    return ChatPromptTemplate.from_messages(
+        [("system", summary_system_prompt),
+            MessagesPlaceholder("history"),
+        ])
+
+# Chat model talking to the OpenAI API over a pooled, keep-alive connection set
+def openai_chat_model(model, key=None, base_url=None):
+    import httpx
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model=model,
+        api_key=key if key is not None else api_key(),
+        base_url=base_url,
+        # Retries are up to the dispatcher
+        max_retries=0,
+        http_async_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS, max_keepalive_connections=MAX_CONCURRENT_REQUESTS, keepalive_expiry=HTTP_KEEPALIVE_EXPIRY),
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        ),
+    )
+
+# Process-wide model client: one chat model with a pooled, keep-alive HTTP
+# connection set. Calls go through the dispatcher, which limits concurrency,
+# applies deadlines and retries, and coalesces identical requests.
+class LLMClient():
+    def __init__(self, model = "gpt-4o", key = None, llm = None, dispatcher = None, base_url = None):
+        # Any LangChain chat model can be passed in, e.g. a fake one for benchmarks
+        if llm is None:
+            llm = openai_chat_model(model, key, base_url)
+        self.llm = llm
+        self.chain = instruct_prompt() | self.llm
+        self.summary_chain = summary_prompt() | self.llm
+        self.dispatcher = dispatcher if dispatcher is not None else get_dispatcher()
+
+    def invoke(self, inputs):
+        return self.dispatcher.invoke(self.chain, inputs)
+
+    def stream(self, inputs):
+        yield from self.dispatcher.stream(self.chain, inputs)
+
+    async def astream(self, inputs):
+        async for chunk in self.dispatcher.astream(self.chain, inputs):
+            yield chunk
+
+    # New rolling summary from the previous one and the messages to fold in
+    def summarize(self, summary, messages):
+        inputs = {"summary": summary or "(none)", "history": messages, "words": SUMMARY_WORDS}
+        return self.dispatcher.invoke(self.summary_chain, inputs).content
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+# Shared client for a model, created on first use
+def get_client(model = "gpt-4o"):
+    with _clients_lock:
+        if model not in _clients:
+            _clients[model] = LLMClient(model=model)
+        return _clients[model]
+
+# Per-session conversation. Cheap to create: it only holds the memory and
+# uses the shared client once the first question is asked.
+# Standalone questions (the first of a conversation) go through the shared
+# response cache; pass cache=False to always ask the model.
+# Every question is sent with the top snippets from the retrieval index;
+# retriever can be any callable question -> snippets, or False for none.
+class Bot():
+    def __init__(self, model = "gpt-4o", llm = None, client = None, cache = None, retriever = None):
+        self.model = model
+        self.memory = ConversationMemory(summarize=lambda summary, messages: self.client.summarize(summary, messages))
+        if client is None and llm is not None:
+            client = LLMClient(llm=llm)
+        self._client = client
+        self._cache = cache
+        self.retriever = retrieve if retriever is None else retriever
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_client(self.model)
+        return self._client
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            self._cache = get_response_cache()
+        return self._cache or None
+
+    def _inputs(self, prompt, language, context, user):
+        return {
+            "history" : self.memory.window(),
+            "housing_context" : context,
+            "knowledge" : "\n".join(self.retriever(prompt)) if self.retriever else "",
+            "user" : describe_profile(user),
+            "output_language": language,
+            "input": prompt,
+        }
+
+    # Cached answer for this turn, or None. Follow-up questions may refer to
+    # earlier turns, so only the first question of a conversation is looked up.
+    def _cached(self, prompt, language, context, user):
+        if self.memory or self.cache is None:
+            return None
+        return self.cache.lookup(prompt, language, user, context)
+
+    def _remember(self, prompt, language, context, user, answer, started):
+        if not self.memory and self.cache is not None and answer:
+            self.cache.store(prompt, language, user, context, answer, time.perf_counter() - started)
+
+    @timed("bot_ask")
     def ask(self, prompt, language = "English", context = "", user = "average person"):
-        self.history = self.history[-18:]
-        
-        answer = self.chain.invoke(
-            {   
-                "history" : self.history,
-                "housing_context" : context,
-                "user" : str(user),
-                "output_language": language,
-                "input": prompt,
-
-            }
-        ).content  
-
-        self.history.append(HumanMessage(prompt))
-        
+        answer = self._cached(prompt, language, context, user)
+        if answer is None:
+            started = time.perf_counter()
+            answer = self.client.invoke(self._inputs(prompt, language, context, user)).content
+            self._remember(prompt, language, context, user, answer, started)
 
+        self.memory.add_turn(prompt, answer)
         return answer
 
+    # Same as ask(), but yields the answer in chunks as the model produces them.
+    # Timed until the last chunk has been handed out.
+    def stream(self, prompt, language = "English", context = "", user = "average person"):
+        with timer("bot_stream"):
+            answer = self._cached(prompt, language, context, user)
+            if answer is not None:
+                yield answer
+            else:
+                started = time.perf_counter()
+                chunks = []
+                for chunk in self.client.stream(self._inputs(prompt, language, context, user)):
+                    if chunk.content:
+                        chunks.append(chunk.content)
+                        yield chunk.content
+                answer = "".join(chunks)
+                self._remember(prompt, language, context, user, answer, started)
+
+            self.memory.add_turn(prompt, answer)
+
+    # Async version of stream()
+    async def astream(self, prompt, language = "English", context = "", user = "average person"):
+        answer = self._cached(prompt, language, context, user)
+        if answer is not None:
+            yield answer
+        else:
+            started = time.perf_counter()
+            chunks = []
+            async for chunk in self.client.astream(self._inputs(prompt, language, context, user)):
+                if chunk.content:
+                    chunks.append(chunk.content)
+                    yield chunk.content
+            answer = "".join(chunks)
+            self._remember(prompt, language, context, user, answer, started)
+
+        self.memory.add_turn(prompt, answer)
+
 if __name__ == "__main__":
     chatbot = Bot()
     while True:
         question = input("You: ")
         print("AI: " + chatbot.ask(question))
-        
+
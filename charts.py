@@ -0,0 +1,50 @@
+import functools
+import altair as alt
+import numpy as np
+import pandas as pd
+from finance import amortization_schedule, scenario_grid
+
+# Chart specs kept per process; a rerun with the same inputs reuses the spec
+CHART_CACHE_SIZE = 128
+
+# Charts are Vega-Lite specs rendered in the browser: nothing is drawn on the
+# server, no figure objects are kept, and building one (data, encoding,
+# schema validation) happens once per input set. Specs are shared between
+# sessions, so callers must not modify them.
+
+# Cumulative interest and principal paid over the life of a loan
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def payment_breakdown_chart(principal, rate, years):
+    schedule = amortization_schedule(principal, rate, years)
+    months = np.arange(1, schedule.periods[0] + 1)
+    data = pd.DataFrame({
+        "Month": months,
+        "Interest": np.cumsum(schedule.interest[0, :len(months)]).round(2),
+        "Principal": np.cumsum(schedule.principal[0, :len(months)]).round(2),
+    }).melt("Month", var_name="Part", value_name="Paid so far (€)")
+    return alt.Chart(data).mark_line().encode(
+        x=alt.X("Month:Q"),
+        y=alt.Y("Paid so far (€):Q"),
+        color=alt.Color("Part:N"),
+        tooltip=["Part:N", "Month:Q", alt.Tooltip("Paid so far (€):Q", format=",.2f")],
+    ).to_dict()
+
+# Heatmap of one scenario metric over rate x term, one panel per down payment.
+# Takes the scenario_grid() inputs as hashable values.
+@functools.lru_cache(maxsize=CHART_CACHE_SIZE)
+def scenario_heatmap(price, down_payments, rates, terms, special_repayment, fixed_years, refinance_rate, column, title, number_format):
+    grid = scenario_grid(price, down_payments, rates, terms, special_repayment, fixed_years, refinance_rate)
+    values = grid[["down_payment", "rate", "years", column]].to_dict("records")
+    return alt.Chart(alt.InlineData(values=values)).mark_rect().encode(
+        x=alt.X("years:O", title="Loan term (years)"),
+        y=alt.Y("rate:O", title="Interest rate (%)", sort="descending"),
+        color=alt.Color(f"{column}:Q", title=title, scale=alt.Scale(scheme="redyellowgreen", reverse=True)),
+        tooltip=[
+            alt.Tooltip("down_payment:Q", title="Down payment (€)", format=",.0f"),
+            alt.Tooltip("rate:Q", title="Rate (%)"),
+            alt.Tooltip("years:Q", title="Term (years)"),
+            alt.Tooltip(f"{column}:Q", title=title, format=number_format),
+        ],
+    ).properties(width=60 * len(terms), height=min(12 * len(rates), 400)).facet(
+        row=alt.Row("down_payment:O", title="Down payment (€)", header=alt.Header(format=",.0f", formatType="number")),
+    ).to_dict()
@@ -0,0 +1,85 @@
+import functools
+import numpy as np
+import tiktoken
+from embeddings import HashingEmbedder
+from listings import get_store, preference_labels
+
+# Token budget for the assessed listings in the assistant prompt
+CONTEXT_TOKEN_BUDGET = 600
+
+# Token budget for the user profile in the assistant prompt
+PROFILE_TOKEN_BUDGET = 80
+
+# Encoding of the gpt-4o family
+TOKEN_ENCODING = "o200k_base"
+
+# Profile fields that matter for housing advice; contact details are left out
+PROFILE_FIELDS = [("job", "job"), ("age", "age"), ("gender", "gender"), ("monthly_income", "income €/month")]
+
+# tiktoken encoding, or None if it cannot be loaded (it is downloaded on
+# first use, which fails offline)
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception:
+        return None
+
+# Number of prompt tokens of a text. Without the encoding, falls back to an
+# estimate of 3 characters per token, which overcounts typical text slightly
+# so the budget still holds.
+def count_tokens(text):
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(len(text) // 3, len(text.split()))
+
+# One-line description of a listing row
+def listing_line(house):
+    parts = [f"#{house.id} {house.type} in {house.region}", f"€{house.price}", f"{house.size} m²",
+             f"transport {house.transportation}/10", "shared" if house.shared_living else "private"]
+    amenities = [name for name, near in (("schools", house.proximity_schools), ("parks", house.proximity_parks)) if near]
+    if amenities:
+        parts.append("near " + " and ".join(amenities))
+    parts.append("for " + "/".join(preference_labels(house.preferences)).lower())
+    parts.append(str(house.address))
+    return ", ".join(parts)
+
+# Compact profile description for the prompt, e.g. "job Student; age 23; income €/month 900"
+def describe_profile(user, budget=PROFILE_TOKEN_BUDGET):
+    if not isinstance(user, dict):
+        return str(user)
+    parts = []
+    for field, label in PROFILE_FIELDS:
+        value = user.get(field)
+        if isinstance(value, list):
+            value = "/".join(value)
+        if value not in (None, ""):
+            parts.append(f"{label} {value}")
+    text = "; ".join(parts) or "average person"
+    while count_tokens(text) > budget and ";" in text:
+        text = text.rsplit(";", 1)[0]
+    return text
+
+# Housing context for a question: the assessed listings, deduplicated,
+# most relevant to the question first, cut off at the token budget.
+# Relevance is the similarity of the question and the listing line; among
+# equally relevant listings the most recently assessed wins.
+def build_housing_context(listing_ids, question, budget=CONTEXT_TOKEN_BUDGET, store=None, embedder=None):
+    ids = list(dict.fromkeys(reversed(listing_ids)))
+    if not ids:
+        return ""
+    store = store if store is not None else get_store()
+    embedder = embedder if embedder is not None else HashingEmbedder()
+    lines = [listing_line(house) for house in store.by_ids(ids).itertuples(index=False)]
+    relevance = embedder.embed_many(lines) @ embedder.embed(question)
+    order = np.argsort(-relevance, kind='stable')
+
+    selected, used = [], 0
+    for position in order:
+        tokens = count_tokens(lines[position]) + 1
+        if used + tokens > budget:
+            continue
+        selected.append(lines[position])
+        used += tokens
+    return "\n".join(selected)
@@ -0,0 +1,230 @@
+import asyncio
+import functools
+import queue
+import threading
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+from metrics import registry
+
+# Upstream requests one process may have in flight at the same time
+MAX_CONCURRENT_REQUESTS = 8
+
+# Seconds a call may take in total, including waiting for a slot and retries
+CALL_DEADLINE = 60.0
+
+# Attempts per call (the first one included)
+MAX_ATTEMPTS = 3
+
+# Jittered exponential backoff between attempts, in seconds
+RETRY_WAIT = wait_random_exponential(multiplier=0.5, max=8)
+
+# Errors worth another attempt: connection problems, rate limits and 5xx.
+# Resolved on the first failure, so importing the dispatcher does not load
+# the HTTP and OpenAI clients.
+@functools.lru_cache(maxsize=None)
+def retryable_errors():
+    import httpx
+    import openai
+    return (
+        httpx.TransportError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
+
+def is_retryable(error):
+    return isinstance(error, retryable_errors())
+
+_END = object()
+
+# Runs LLM calls on one background event loop shared by all sessions.
+# A semaphore caps the calls that are in flight upstream; callers beyond
+# that wait in line (queue_depth). Every call has a deadline covering the
+# wait, all attempts and the backoff in between, and retryable errors are
+# retried with jittered exponential backoff. Identical in-flight invoke()
+# calls are coalesced into one upstream request.
+# Sync callers (Streamlit script threads) block on the result; async
+# callers on other loops await it.
+class LLMDispatcher():
+    def __init__(self, max_concurrency=MAX_CONCURRENT_REQUESTS, deadline=CALL_DEADLINE, attempts=MAX_ATTEMPTS, wait=RETRY_WAIT):
+        self.max_concurrency = max_concurrency
+        self.deadline = deadline
+        self.attempts = attempts
+        self.wait = wait
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-dispatcher", daemon=True)
+        self._thread.start()
+        self._slots = asyncio.run_coroutine_threadsafe(self._create_semaphore(), self._loop).result()
+        self._inflight = {}
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.in_flight = 0
+        self.calls = 0
+        self.coalesced = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    async def _create_semaphore(self):
+        return asyncio.Semaphore(self.max_concurrency)
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+        }
+
+    # Wait for an upstream slot, counting the wait as queue depth
+    async def _acquire(self):
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queue_depth -= 1
+        self.in_flight += 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self._slots.release()
+
+    def _retrying(self):
+        def count_retry(retry_state):
+            self.retries += 1
+        return AsyncRetrying(
+            stop=stop_after_attempt(self.attempts),
+            wait=self.wait,
+            retry=retry_if_exception(is_retryable),
+            before_sleep=count_retry,
+            reraise=True,
+        )
+
+    async def _invoke(self, chain, inputs):
+        await self._acquire()
+        try:
+            async for attempt in self._retrying():
+                with attempt:
+                    self.calls += 1
+                    return await chain.ainvoke(inputs)
+        finally:
+            self._release()
+
+    # Run a call within its deadline, counting timeouts and failures
+    async def _bounded(self, call, deadline):
+        try:
+            return await asyncio.wait_for(call, deadline)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"LLM call did not finish within {deadline:.0f}s") from None
+        except Exception:
+            self.failures += 1
+            raise
+
+    async def _coalesced(self, chain, inputs, deadline):
+        key = (id(chain), repr(inputs))
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = self._loop.create_task(self._bounded(self._invoke(chain, inputs), deadline))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Callers that give up must not cancel the shared call
+        return await asyncio.shield(task)
+
+    # Result of chain.ainvoke(inputs), from a synchronous caller
+    def invoke(self, chain, inputs, deadline=None):
+        deadline = deadline or self.deadline
+        return asyncio.run_coroutine_threadsafe(self._coalesced(chain, inputs, deadline), self._loop).result()
+
+    # Result of chain.ainvoke(inputs), from a coroutine on any event loop
+    async def ainvoke(self, chain, inputs, deadline=None):
+        deadline = deadline or self.deadline
+        future = asyncio.run_coroutine_threadsafe(self._coalesced(chain, inputs, deadline), self._loop)
+        return await asyncio.wrap_future(future)
+
+    # Stream chain.astream(inputs) into put(chunk), then put(_END).
+    # The deadline covers the whole stream: the wait for a slot, the attempts
+    # and every chunk. Attempts are retried until a chunk has arrived; once an
+    # answer has started it is not retried.
+    async def _stream(self, chain, inputs, deadline, put):
+        acquired = False
+        stream = None
+
+        async def first_chunk():
+            nonlocal acquired, stream
+            await self._acquire()
+            acquired = True
+            async for attempt in self._retrying():
+                with attempt:
+                    self.calls += 1
+                    stream = chain.astream(inputs)
+                    return await anext(stream, _END)
+
+        async def all_chunks():
+            first = await first_chunk()
+            if first is not _END:
+                put(first)
+                async for chunk in stream:
+                    put(chunk)
+
+        try:
+            try:
+                await self._bounded(all_chunks(), deadline)
+            finally:
+                # Close the upstream response when the stream timed out or
+                # the caller went away
+                if stream is not None:
+                    await stream.aclose()
+                if acquired:
+                    self._release()
+        except BaseException as error:
+            put(error)
+        put(_END)
+
+    # Chunks of chain.astream(inputs), for a synchronous caller. A caller
+    # that stops iterating early cancels the upstream call and frees its slot.
+    def stream(self, chain, inputs, deadline=None):
+        chunks = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._stream(chain, inputs, deadline or self.deadline, chunks.put), self._loop)
+        try:
+            while (chunk := chunks.get()) is not _END:
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+        finally:
+            future.cancel()
+
+    # Chunks of chain.astream(inputs), for a coroutine on any event loop
+    async def astream(self, chain, inputs, deadline=None):
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream(chain, inputs, deadline or self.deadline, lambda chunk: loop.call_soon_threadsafe(chunks.put_nowait, chunk)),
+            self._loop,
+        )
+        try:
+            while (chunk := await chunks.get()) is not _END:
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+        finally:
+            future.cancel()
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+# Process-wide dispatcher, started on first use
+def get_dispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = LLMDispatcher()
+                registry.register_stats("speedy_home_llm_dispatcher", _dispatcher.stats)
+    return _dispatcher
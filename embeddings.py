@@ -0,0 +1,34 @@
+import re
+import zlib
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Lowercased word tokens of a text
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+# Local, offline stand-in for an embedding model.
+# Words and word bigrams are hashed into a fixed number of signed buckets and
+# the vector is L2-normalized, so the dot product of two embeddings is their
+# cosine similarity. Deterministic across processes (crc32, not hash()).
+class HashingEmbedder():
+    def __init__(self, dim=512):
+        self.dim = dim
+
+    def _features(self, text):
+        words = tokenize(text)
+        return words + [a + " " + b for a, b in zip(words, words[1:])]
+
+    def embed(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            h = zlib.crc32(feature.encode("utf-8"))
+            vector[h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts):
+        if not texts:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.stack([self.embed(text) for text in texts])
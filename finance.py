@@ -0,0 +1,196 @@
+import itertools
+import threading
+from cachetools import LRUCache
+import numpy as np
+import pandas as pd
+from metrics import registry
+
+# Payments per year of a German annuity loan
+PERIODS_PER_YEAR = 12
+
+# Payment schedules of a batch of loans as (loans, periods) arrays.
+# Rows are padded with zeros after a loan's last payment, so loans with
+# different terms share one array.
+class Schedule():
+    def __init__(self, payment, interest, principal, balance, periods):
+        self.payment = payment
+        self.interest = interest
+        self.principal = principal
+        self.balance = balance
+        self.periods = periods
+
+    def __len__(self):
+        return len(self.payment)
+
+    @property
+    def total_interest(self):
+        return self.interest.sum(axis=-1)
+
+    @property
+    def total_paid(self):
+        return self.total_interest + self.principal.sum(axis=-1)
+
+# Monthly payment of an annuity loan. Arguments broadcast against each other.
+def annuity_payment(principal, annual_rate, years, periods_per_year=PERIODS_PER_YEAR):
+    principal = np.asarray(principal, dtype=float)
+    r = np.asarray(annual_rate, dtype=float) / 100 / periods_per_year
+    n = np.round(np.asarray(years, dtype=float) * periods_per_year)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1 + r) ** n
+        payment = principal * r * growth / (growth - 1)
+        return np.where(r == 0, principal / n, payment)
+
+# Full amortization schedules for many loans at once.
+# principal (€), annual_rate (% per year) and years broadcast to a batch of
+# loans; the result has one row per loan. Closed form, no per-period loop:
+# the balance after k payments is P(1+r)^k - A((1+r)^k - 1)/r, each period's
+# interest is r times the previous balance and the rest of the payment
+# repays principal. Arrays are updated in place to keep memory passes low.
+def amortization_schedule(principal, annual_rate, years, periods_per_year=PERIODS_PER_YEAR):
+    principal, annual_rate, years = (np.ravel(a) for a in np.broadcast_arrays(
+        np.asarray(principal, dtype=float), np.asarray(annual_rate, dtype=float), np.asarray(years, dtype=float)))
+    r = annual_rate / 100 / periods_per_year
+    n = np.round(years * periods_per_year).astype(np.int64)
+    payment = annuity_payment(principal, annual_rate, years, periods_per_year)
+
+    # balance[:, k] is the balance after k payments, balance[:, 0] the loan amount
+    k = np.arange(n.max() + 1 if len(n) else 1)
+    balance = np.power.outer(1 + r, k)
+    # Interest-free rows come out as nan here and are filled in below
+    with np.errstate(divide='ignore', invalid='ignore'):
+        remaining = payment / r
+        balance *= (principal - remaining)[:, None]
+        balance += remaining[:, None]
+    interest_free = np.flatnonzero(r == 0)
+    balance[interest_free] = principal[interest_free, None] - payment[interest_free, None] * k
+
+    # Nothing is owed after the last payment; rows of the same term are cleared together
+    for term in np.unique(n):
+        balance[n == term, term:] = 0.0
+
+    interest = balance[:, :-1] * r[:, None]
+    repaid = balance[:, :-1] - balance[:, 1:]
+    return Schedule(payment=payment, interest=interest, principal=repaid, balance=balance[:, 1:], periods=n)
+
+# Scenario results, in this order per cell
+SCENARIO_FIELDS = ('loan', 'payment', 'total_interest', 'payoff_years', 'balance_at_refinance')
+
+# Simulate loans month by month, vectorized across all of them.
+# German specifics: special_repayment (Sondertilgung) pays off that percentage
+# of the original loan at the end of every year, capped by what is left;
+# after fixed_years (Zinsbindung) the remaining balance is refinanced at
+# refinance_rate over the rest of the term. The monthly payment stays the
+# same otherwise, so special repayments shorten the loan.
+# This does not reuse amortization_schedule(): its closed form assumes one
+# rate and one payment over the whole term, which yearly special repayments
+# (capped by the remaining balance) and the refinancing break. The loop runs
+# over months only (at most 480), each step one array operation across all
+# loans, and keeps just the running totals instead of full schedules.
+# Returns a dict of SCENARIO_FIELDS arrays, one value per loan.
+def simulate_loans(principal, annual_rate, years, special_repayment=0.0, fixed_years=None, refinance_rate=None,
+                   periods_per_year=PERIODS_PER_YEAR):
+    principal, annual_rate, years, special_repayment, fixed_years, refinance_rate = (
+        np.ravel(a).astype(float) for a in np.broadcast_arrays(
+            principal, annual_rate, years, special_repayment,
+            years if fixed_years is None else fixed_years,
+            annual_rate if refinance_rate is None else refinance_rate,
+        )
+    )
+    n = np.round(years * periods_per_year).astype(np.int64)
+    refinance_at = np.minimum(np.round(fixed_years * periods_per_year).astype(np.int64), n)
+    payment = annuity_payment(principal, annual_rate, years, periods_per_year)
+    current_payment = payment.copy()
+    r = annual_rate / 100 / periods_per_year
+    special = principal * special_repayment / 100
+
+    balance = principal.copy()
+    total_interest = np.zeros_like(balance)
+    balance_at_refinance = np.where(refinance_at >= n, 0.0, np.nan)
+    payoff = n.copy()
+    for month in range(1, int(n.max()) + 1 if len(n) else 1):
+        refinance = (refinance_at == month - 1) & (refinance_at < n)
+        if refinance.any():
+            balance_at_refinance[refinance] = balance[refinance]
+            r = np.where(refinance, refinance_rate / 100 / periods_per_year, r)
+            remaining_years = (n - refinance_at) / periods_per_year
+            current_payment = np.where(refinance, annuity_payment(balance, refinance_rate, remaining_years, periods_per_year), current_payment)
+        interest = balance * r
+        total_interest += interest
+        balance = np.maximum(balance + interest - current_payment, 0.0)
+        if month % periods_per_year == 0:
+            balance = np.maximum(balance - special, 0.0)
+        # Whatever is left at the end of the term is paid with the last installment
+        balance[n == month] = 0.0
+        paid_off = (balance == 0) & (payoff == n) & (month < n)
+        payoff[paid_off] = month
+    return {
+        'loan': principal,
+        'payment': payment,
+        'total_interest': total_interest,
+        'payoff_years': payoff / periods_per_year,
+        'balance_at_refinance': balance_at_refinance,
+    }
+
+# Results of scenario cells keyed on their inputs, shared by all sessions.
+# A grid only simulates the cells that are not cached yet, so changing one
+# axis of the grid recomputes just the new rows and columns. Whole grids are
+# kept too, so rerunning with the same inputs costs a dict lookup.
+class ScenarioCache():
+    def __init__(self, maxsize=200_000, max_grids=64):
+        self._lock = threading.Lock()
+        self._cells = LRUCache(maxsize=maxsize)
+        self._grids = LRUCache(maxsize=max_grids)
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, cells):
+        with self._lock:
+            results = [self._cells.get(cell) for cell in cells]
+            missing = [cell for cell, result in zip(cells, results) if result is None]
+            self.hits += len(cells) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            price, down, rate, years, special, fixed, refinance = np.array(missing, dtype=float).T
+            simulated = simulate_loans(np.maximum(price - down, 0.0), rate, years, special, fixed, refinance)
+            computed = dict(zip(missing, zip(*(simulated[field].tolist() for field in SCENARIO_FIELDS))))
+            with self._lock:
+                self._cells.update(computed)
+            results = [computed[cell] if result is None else result for cell, result in zip(cells, results)]
+        return results
+
+    # Grid for a normalized input set, built with build() when not cached
+    def grid(self, key, build):
+        with self._lock:
+            grid = self._grids.get(key)
+        if grid is None:
+            grid = build()
+            with self._lock:
+                self._grids[key] = grid
+        return grid
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0, 'size': len(self._cells)}
+
+scenario_cache = ScenarioCache()
+registry.register_stats("speedy_home_cache", scenario_cache.stats, cache="scenario")
+
+# Evaluate every combination of down payment x rate x term for a purchase
+# price. Returns a DataFrame with one row per cell: the inputs plus
+# SCENARIO_FIELDS. Treat it as read-only, it is shared through the cache.
+def scenario_grid(price, down_payments, rates, terms, special_repayment=0.0, fixed_years=None, refinance_rate=None, cache=scenario_cache):
+    key = (float(price), tuple(map(float, down_payments)), tuple(map(float, rates)), tuple(map(float, terms)),
+           float(special_repayment), fixed_years, refinance_rate)
+    return cache.grid(key, lambda: _build_grid(price, down_payments, rates, terms, special_repayment, fixed_years, refinance_rate, cache))
+
+def _build_grid(price, down_payments, rates, terms, special_repayment, fixed_years, refinance_rate, cache):
+    cells = [
+        (float(price), float(down), float(rate), float(term), float(special_repayment),
+         float(term if fixed_years is None else min(fixed_years, term)),
+         float(rate if refinance_rate is None else refinance_rate))
+        for down, rate, term in itertools.product(down_payments, rates, terms)
+    ]
+    frame = pd.DataFrame([cell[1:4] for cell in cells], columns=['down_payment', 'rate', 'years'])
+    results = pd.DataFrame(cache.evaluate(cells), columns=list(SCENARIO_FIELDS))
+    return pd.concat([frame, results], axis=1)
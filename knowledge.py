@@ -0,0 +1,29 @@
+# Static housing knowledge shown in the app and searched by the assistant
+
+# FAQ entries by category, shown on the FAQ page
+FAQS = {
+    "General": [
+        {"question": "What is this platform for?", "answer": "This platform helps you navigate the housing market in Germany with tools and guides tailored to your needs."},
+        {"question": "Who can use this platform?", "answer": "Anyone looking for housing in Germany, including professionals, students, and families."},
+    ],
+    "Housing Terms": [
+        {"question": "What is a mortgage?", "answer": "A mortgage is a loan used to purchase a property, secured against the property itself."},
+        {"question": "What is 'Vorfälligkeitsentschädigung'?", "answer": "It is a prepayment penalty charged by banks if you pay off your loan early."},
+    ],
+    "Platform Features": [
+        {"question": "How do I edit my profile?", "answer": "Go to the Profile page from the sidebar or click the Profile button at the top of the sidebar."},
+        {"question": "How do I use the Step-by-Step Guide?", "answer": "Navigate to the Step-by-Step Guide page and follow the prompts tailored to your profile."},
+    ],
+}
+
+# Short guides describing what the app's tools do, by title
+GUIDES = {
+    "Step-by-Step Guide for professionals": "Professionals choose between renting and buying, filter by budget and size, and can apply to matching listings directly.",
+    "Step-by-Step Guide for students": "Students choose between renting and shared housing. Shared housing can be limited to student households with a free room whose same-sex preference fits the student, to households of the student's own gender, and to flats for at most as many people as the student wishes.",
+    "Step-by-Step Guide for families": "Families choose between renting and buying, filter by budget and size, and can require schools and parks nearby; only listings open to families are shown.",
+    "Location Visualizer": "The Location Visualizer shows how many matching houses each Munich district has. Click a district to see its houses on the map and assess whether you meet a house's requirements.",
+    "House assessment": "A house is within reach if your monthly income is at least twice its price and you are at least 18 years old.",
+    "Mortgage calculator": "The Financial Tools page computes the monthly payment of an annuity loan from the loan amount, the interest rate and the term in years, and plots how much interest and principal have been paid over time.",
+    "Rental deposit": "By German law a rental deposit (Kaution) may be at most three months of cold rent.",
+    "Offering a house": "On the Offer a House page owners list a property for rent, sale or shared housing, with its address, price, size, whether schools and parks are close by, and who it is meant for.",
+}
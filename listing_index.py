@@ -0,0 +1,178 @@
+import numpy as np
+
+# Mean earth radius in meters
+EARTH_RADIUS = 6_371_000.0
+
+# Appended points are searched linearly until there are this many, then the tree is rebuilt
+SPATIAL_REBUILD_TAIL = 1024
+
+# k-d tree over projected points. SciPy is only loaded by the pages that
+# search by location.
+def _kd_tree(points):
+    from scipy.spatial import cKDTree
+    return cKDTree(points)
+
+# Columns that get a sorted order for binary-search range lookups
+RANGE_COLUMNS = ('price', 'size')
+
+# Group row positions by the categories of a categorical column
+def partition_positions(series):
+    codes = series.cat.codes.to_numpy()
+    order = np.argsort(codes, kind='stable')
+    bounds = np.cumsum(np.bincount(codes[codes >= 0], minlength=len(series.cat.categories)))
+    start = np.count_nonzero(codes < 0)
+    partitions = {}
+    for category, end in zip(series.cat.categories, bounds + start):
+        partitions[category] = order[start:end]
+        start = end
+    return partitions
+
+# Secondary indexes over one immutable listing snapshot.
+# Row positions are partitioned by type and region; price and size have a
+# sorted order both globally (key None) and inside each type partition, so
+# range lookups cost O(log n + matches) instead of a full scan.
+class ListingIndex():
+    def __init__(self, frame):
+        self.frame = frame
+        self.by_type = partition_positions(frame['type'])
+        self.by_region = partition_positions(frame['region'])
+        self._sorted = {}
+        partitions = [(None, np.arange(len(frame)))] + list(self.by_type.items())
+        for key, positions in partitions:
+            for column in RANGE_COLUMNS:
+                values = frame[column].to_numpy()[positions]
+                order = np.argsort(values, kind='stable')
+                self._sorted[(key, column)] = (values[order], positions[order])
+
+    # New index over a snapshot that only appended rows to this one.
+    # Appended positions are merged into the existing arrays instead of
+    # re-sorting everything.
+    def extended(self, frame):
+        start = len(self.frame)
+        if len(frame) == start:
+            return self
+        new = frame.iloc[start:]
+        index = ListingIndex.__new__(ListingIndex)
+        index.frame = frame
+        index.by_type = self._merge_partitions(self.by_type, new['type'], start)
+        index.by_region = self._merge_partitions(self.by_region, new['region'], start)
+        index._sorted = {}
+        for (key, column), (values, positions) in self._sorted.items():
+            added = np.arange(start, len(frame))
+            if key is not None:
+                added = added[(new['type'] == key).to_numpy()]
+            added_values = frame[column].to_numpy()[added]
+            order = np.argsort(added_values, kind='stable')
+            added, added_values = added[order], added_values[order]
+            at = np.searchsorted(values, added_values, side='right')
+            index._sorted[(key, column)] = (np.insert(values, at, added_values), np.insert(positions, at, added))
+        return index
+
+    @staticmethod
+    def _merge_partitions(partitions, series, start):
+        merged = dict(partitions)
+        for category, positions in partition_positions(series).items():
+            if len(positions):
+                merged[category] = np.concatenate([partitions[category], positions + start])
+        return merged
+
+    def __len__(self):
+        return len(self.frame)
+
+    # Row positions of a type and/or region partition (all rows if neither)
+    def partition(self, type=None, region=None):
+        if type is None and region is None:
+            return np.arange(len(self.frame))
+        if region is None:
+            return self.by_type[type]
+        positions = self.by_region[region]
+        if type is not None:
+            positions = positions[(self.frame['type'].to_numpy()[positions] == type)]
+        return positions
+
+    # Bounds into the sorted (values, positions) pair for lo <= value <= hi
+    def _bounds(self, column, lo, hi, type):
+        values, positions = self._sorted[(type, column)]
+        left = 0 if lo is None else np.searchsorted(values, lo, side='left')
+        right = len(values) if hi is None else np.searchsorted(values, hi, side='right')
+        return positions, left, max(left, right)
+
+    # Row positions with lo <= column <= hi, optionally inside a type partition.
+    # Positions come back in column order.
+    def range(self, column, lo=None, hi=None, type=None):
+        positions, left, right = self._bounds(column, lo, hi, type)
+        return positions[left:right]
+
+    # Number of rows a range lookup would return, without materializing them
+    def count_range(self, column, lo=None, hi=None, type=None):
+        _, left, right = self._bounds(column, lo, hi, type)
+        return right - left
+
+# Nearest-neighbour and radius lookups over lat/lon points.
+# Points are projected onto a local equirectangular plane in meters (exact
+# enough at city scale), so distances are real meters rather than degrees.
+# Points appended after the tree was built are kept in a small tail that is
+# scanned linearly until it is large enough to warrant a rebuild.
+class SpatialIndex():
+    def __init__(self, lat, lon, ref_lat=None):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        if ref_lat is None:
+            ref_lat = float(lat.mean()) if len(lat) else 0.0
+        self.ref_lat = ref_lat
+        self._xy = self.project(lat, lon)
+        self._tree = _kd_tree(self._xy)
+        self._tail = np.empty((0, 2))
+
+    def __len__(self):
+        return len(self._xy) + len(self._tail)
+
+    # Lat/lon degrees to local (x, y) meters
+    def project(self, lat, lon):
+        lat = np.radians(np.asarray(lat, dtype=float))
+        lon = np.radians(np.asarray(lon, dtype=float))
+        return np.column_stack([lon * np.cos(np.radians(self.ref_lat)) * EARTH_RADIUS, lat * EARTH_RADIUS])
+
+    # New index with more points appended (positions continue after the existing ones)
+    def extended(self, lat, lon):
+        if len(lat) == 0:
+            return self
+        index = SpatialIndex.__new__(SpatialIndex)
+        index.ref_lat = self.ref_lat
+        tail = np.concatenate([self._tail, index.project(lat, lon)])
+        if len(tail) > SPATIAL_REBUILD_TAIL:
+            index._xy = np.concatenate([self._xy, tail])
+            index._tree = _kd_tree(index._xy)
+            index._tail = np.empty((0, 2))
+        else:
+            index._xy, index._tree, index._tail = self._xy, self._tree, tail
+        return index
+
+    # (position, distance in meters) of the nearest point, or None if there is
+    # none within max_distance
+    def nearest(self, lat, lon, max_distance=np.inf):
+        point = self.project([lat], [lon])[0]
+        best, best_distance = None, max_distance
+        if len(self._xy):
+            distance, position = self._tree.query(point, distance_upper_bound=max_distance)
+            if np.isfinite(distance):
+                best, best_distance = int(position), float(distance)
+        if len(self._tail):
+            distances = np.hypot(*(self._tail - point).T)
+            position = int(distances.argmin())
+            if distances[position] <= best_distance:
+                best, best_distance = len(self._xy) + position, float(distances[position])
+        if best is None:
+            return None
+        return best, best_distance
+
+    # Positions of all points within radius meters, nearest first
+    def within(self, lat, lon, radius):
+        point = self.project([lat], [lon])[0]
+        positions = np.asarray(self._tree.query_ball_point(point, radius), dtype=np.int64) if len(self._xy) else np.empty(0, dtype=np.int64)
+        if len(self._tail):
+            tail_distances = np.hypot(*(self._tail - point).T)
+            positions = np.concatenate([positions, len(self._xy) + np.flatnonzero(tail_distances <= radius)])
+        all_xy = self._xy if not len(self._tail) else np.concatenate([self._xy, self._tail])
+        distances = np.hypot(*(all_xy[positions] - point).T)
+        return positions[np.argsort(distances, kind='stable')]
@@ -0,0 +1,265 @@
+import threading
+import numpy as np
+from cachetools import TTLCache
+from listing_index import RANGE_COLUMNS
+from listings import audience_mask, get_store
+from metrics import registry, timed
+
+# Rough fraction of rows kept by predicates the index cannot count exactly.
+# Only used to order the residual filters, so they just need to be plausible.
+AUDIENCE_SELECTIVITY = 0.6
+AMENITY_SELECTIVITY = 0.5
+SHARED_HOUSING_SELECTIVITY = 0.3
+EQUALS_SELECTIVITY = 0.5
+
+# Matches of a query: an immutable snapshot plus the matching row positions.
+# Rows are only materialized when asked for.
+class ListingResult():
+    def __init__(self, frame, positions):
+        self.frame = frame
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def empty(self):
+        return len(self.positions) == 0
+
+    def to_frame(self, start=0, stop=None):
+        return self.frame.iloc[self.positions[start:stop]]
+
+    # Lightweight named-tuple rows for positions[start:stop]
+    def rows(self, start=0, stop=None):
+        return self.to_frame(start, stop).itertuples(index=False)
+
+# Declarative listing filter shared by the guide flows and the location visualizer.
+# Build it with the chainable predicate methods, then run() it against a
+# ListingIndex. The planner picks the smallest index-backed candidate set
+# (type/region partition or a price/size range) and applies the remaining
+# predicates to the shrinking candidate set in selectivity order.
+class ListingQuery():
+    def __init__(self, type=None, region=None):
+        self.type = type
+        self.region = region
+        self.ranges = {}
+        self.audience = None
+        self.amenities = ()
+        self.shared = None
+        self.equals = {}
+
+    # Inclusive price range (None leaves that side open)
+    def price(self, lo=None, hi=None):
+        return self._range('price', lo, hi)
+
+    # Inclusive size range in sq. meters
+    def size(self, lo=None, hi=None):
+        return self._range('size', lo, hi)
+
+    # Inclusive transportation score range
+    def transport(self, lo=None, hi=None):
+        return self._range('transportation', lo, hi)
+
+    def _range(self, column, lo, hi):
+        if lo is not None or hi is not None:
+            self.ranges[column] = (lo, hi)
+        return self
+
+    # Listings open to this audience (listings with 'No preference' always are)
+    def for_audience(self, audience):
+        self.audience = audience
+        return self
+
+    # Require the given amenities, e.g. with_amenities(schools=True)
+    def with_amenities(self, schools=False, parks=False):
+        self.amenities = tuple(name for name, wanted in
+                               (('proximity_schools', schools), ('proximity_parks', parks)) if wanted)
+        return self
+
+    # Shared flats with a free room that would take a person of this gender.
+    # students_only keeps student households, same_gender only households of
+    # that gender; max_people caps the household size the flat is meant for.
+    def shared_housing(self, gender, students_only=True, same_gender=False, max_people=None):
+        self.shared = (gender, students_only, same_gender, max_people)
+        return self
+
+    def shared_living(self, value):
+        self.equals['shared_living'] = bool(value)
+        return self
+
+    # Normalized, hashable form of the query
+    def key(self):
+        return (
+            self.type,
+            self.region,
+            tuple(sorted(self.ranges.items())),
+            self.audience,
+            self.amenities,
+            self.shared,
+            tuple(sorted(self.equals.items())),
+        )
+
+    # Store partitions whose changes can affect the result
+    def partitions(self):
+        keys = []
+        if self.type is not None:
+            keys.append(('type', self.type))
+        if self.region is not None:
+            keys.append(('region', self.region))
+        return keys
+
+    # Candidate sources the index can produce directly, as (size, name, fetch)
+    def _sources(self, index):
+        sources = []
+        if self.type is not None or self.region is not None:
+            if self.region is None:
+                size = len(index.by_type[self.type])
+            else:
+                size = len(index.by_region[self.region])
+            sources.append((size, 'partition', lambda: index.partition(self.type, self.region)))
+        for column, (lo, hi) in self.ranges.items():
+            if column in RANGE_COLUMNS:
+                size = index.count_range(column, lo, hi, type=self.type)
+                sources.append((size, column, lambda column=column, lo=lo, hi=hi:
+                                np.sort(index.range(column, lo, hi, type=self.type))))
+        if not sources:
+            sources.append((len(index), 'all', lambda: index.partition()))
+        return sources
+
+    # Residual predicates as (selectivity, name, mask_fn(frame) -> bool array)
+    def _filters(self, index, source):
+        total = max(len(index), 1)
+        # Range counts come from the type partition when there is one
+        range_total = max(len(index.by_type[self.type]), 1) if self.type is not None else total
+        filters = []
+        # Range sources are already restricted to the type partition, only the
+        # region still needs checking
+        if source != 'partition' and self.region is not None:
+            size = len(index.by_region[self.region])
+            filters.append((size / total, 'region', lambda df: (df['region'] == self.region).to_numpy()))
+        for column, (lo, hi) in self.ranges.items():
+            if column == source:
+                continue
+            if column in RANGE_COLUMNS:
+                selectivity = index.count_range(column, lo, hi, type=self.type) / range_total
+            else:
+                selectivity = 0.5
+            filters.append((selectivity, column, lambda df, column=column, lo=lo, hi=hi: _in_range(df[column], lo, hi)))
+        if self.audience is not None:
+            mask = audience_mask(self.audience, 'No preference')
+            filters.append((AUDIENCE_SELECTIVITY, 'audience', lambda df: (df['preferences'].to_numpy() & mask) != 0))
+        for column in self.amenities:
+            filters.append((AMENITY_SELECTIVITY, column, lambda df, column=column: df[column].to_numpy()))
+        if self.shared is not None:
+            filters.append((SHARED_HOUSING_SELECTIVITY, 'shared housing', lambda df: _shared_housing_mask(df, *self.shared)))
+        for column, value in self.equals.items():
+            filters.append((EQUALS_SELECTIVITY, column, lambda df, column=column, value=value: (df[column] == value).to_numpy()))
+        return sorted(filters, key=lambda f: f[0])
+
+    # Execution plan as a list of step names, cheapest candidate source first
+    def explain(self, index):
+        size, source, _ = min(self._sources(index), key=lambda s: s[0])
+        return [f"scan {source} ({size} rows)"] + [
+            f"filter {name} (~{selectivity:.0%})" for selectivity, name, _ in self._filters(index, source)
+        ]
+
+    def run(self, index):
+        size, source, fetch = min(self._sources(index), key=lambda s: s[0])
+        positions = fetch()
+        frame = index.frame
+        for _, _, mask_fn in self._filters(index, source):
+            if len(positions) == 0:
+                break
+            positions = positions[mask_fn(_Columns(frame, positions))]
+        return ListingResult(frame, positions)
+
+# Column access restricted to a set of row positions. Only the columns a
+# predicate actually touches are gathered.
+class _Columns():
+    def __init__(self, frame, positions):
+        self.frame = frame
+        self.positions = positions
+        self._columns = {}
+
+    def __getitem__(self, column):
+        if column not in self._columns:
+            self._columns[column] = self.frame[column].iloc[self.positions]
+        return self._columns[column]
+
+def _in_range(series, lo, hi):
+    values = series.to_numpy()
+    mask = np.ones(len(values), dtype=bool)
+    if lo is not None:
+        mask &= values >= lo
+    if hi is not None:
+        mask &= values <= hi
+    return mask
+
+def _shared_housing_mask(df, gender, students_only, same_gender, max_people):
+    if same_gender:
+        mask = (df['gender'] == gender).fillna(False)
+    else:
+        mask = ((df['gender'] == gender) | ~df['same_sex_pref']).fillna(False)
+    mask &= (df['current_people'] < df['max_people']).fillna(False)
+    if max_people is not None:
+        mask &= (df['max_people'] <= max_people).fillna(False)
+    if students_only:
+        mask &= df['is_student'].fillna(False)
+    return mask.to_numpy(dtype=bool)
+
+# Bounded LRU/TTL cache of query results.
+# Entries are keyed on the normalized query and remember the versions of the
+# store partitions the query depends on; a listing added to another type or
+# region leaves them valid. Cached positions stay valid on newer snapshots
+# because the store only ever appends rows.
+class QueryCache():
+    def __init__(self, maxsize=256, ttl=600):
+        self._lock = threading.Lock()
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _versions(query, store):
+        partitions = query.partitions()
+        if not partitions:
+            return (store.version,)
+        return tuple(store.partition_version(key) for key in partitions)
+
+    def run(self, query, store):
+        key = query.key()
+        versions = self._versions(query, store)
+        index = store.index()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions:
+                self.hits += 1
+                return ListingResult(index.frame, entry[1])
+            self.misses += 1
+        result = query.run(index)
+        with self._lock:
+            self._entries[key] = (versions, result.positions)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self._entries.maxsize,
+            }
+
+query_cache = QueryCache()
+registry.register_stats("speedy_home_cache", query_cache.stats, cache="listing_query")
+
+# Run a query against the shared listing store through the result cache
+@timed("listing_filter")
+def find_listings(query):
+    return query_cache.run(query, get_store())
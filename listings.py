@@ -0,0 +1,421 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy.exc import IntegrityError
+from listing_index import ListingIndex, SpatialIndex
+from storage import get_storage
+
+# Define district coordinates
+district_centers = {
+    'Altstadt-Lehel': [48.1371, 11.5753],
+    'Ludwigsvorstadt-Isarvorstadt': [48.1299, 11.5657],
+    'Maxvorstadt': [48.1517, 11.5675],
+    'Schwabing-West': [48.1597, 11.5542],
+    'Au-Haidhausen': [48.1288, 11.5934],
+    'Sendling': [48.1115, 11.5465],
+    'Sendling-Westpark': [48.1202, 11.5191],
+    'Schwanthalerhöhe': [48.1364, 11.5395],
+    'Neuhausen-Nymphenburg': [48.1540, 11.5216],
+    'Moosach': [48.1742, 11.4985],
+    'Milbertshofen-Am Hart': [48.1925, 11.5692],
+    'Schwabing-Freimann': [48.1723, 11.5887],
+    'Bogenhausen': [48.1530, 11.6097],
+    'Berg am Laim': [48.1266, 11.6351],
+    'Trudering-Riem': [48.1210, 11.6574],
+    'Ramersdorf-Perlach': [48.0988, 11.6229],
+    'Obergiesing-Fasangarten': [48.1002, 11.6015],
+    'Untergiesing-Harlaching': [48.0986, 11.5799],
+    'Thalkirchen-Obersendling-Forstenried-Fürstenried-Solln': [48.0965, 11.5232],
+    'Hadern': [48.1148, 11.4837],
+    'Pasing-Obermenzing': [48.1446, 11.4623],
+    'Aubing-Lochhausen-Langwied': [48.1661, 11.4022],
+    'Allach-Untermenzing': [48.1795, 11.4715],
+    'Feldmoching-Hasenbergl': [48.1942, 11.5420],
+    'Laim': [48.1338, 11.5103],
+}
+
+LISTING_TYPES = ['Rent', 'Sale', 'Shared Housing']
+GENDERS = ['Male', 'Female', 'Divers']
+PREFERENCE_OPTIONS = ['Students', 'Professionals', 'Families', 'No preference']
+
+# One bit per preference option; the preferences column stores their OR
+PREFERENCE_BITS = {name: 1 << i for i, name in enumerate(PREFERENCE_OPTIONS)}
+
+# Column dtypes of the listing store. Categoricals use fixed categories so
+# frames built at different times concatenate without falling back to object.
+SCHEMA = {
+    'id': 'int64',
+    'price': 'int32',
+    'transportation': 'int8',
+    'shared_living': 'bool',
+    'lat': 'float64',
+    'lon': 'float64',
+    'region': pd.CategoricalDtype(list(district_centers) + ['Unknown']),
+    'address': 'string[pyarrow]',
+    'type': pd.CategoricalDtype(LISTING_TYPES),
+    'size': 'int32',
+    'preferences': 'uint8',
+    'proximity_schools': 'bool',
+    'proximity_parks': 'bool',
+    'owner_name': 'string[pyarrow]',
+    'gender': pd.CategoricalDtype(GENDERS),
+    'is_student': 'boolean',
+    'current_people': 'Int8',
+    'max_people': 'Int8',
+    'same_sex_pref': 'boolean',
+}
+
+# Accepted (min, max) of the numeric listing fields users enter; all fit the
+# SCHEMA dtypes, so a valid listing never overflows or fails to cast
+LISTING_LIMITS = {
+    'price': (1, 100_000_000),
+    'size': (1, 10_000),
+    'current_people': (0, 50),
+    'max_people': (1, 50),
+}
+
+# Reasons a listing cannot be stored, e.g. ["price must be between 1 and 100000000"]
+def listing_errors(listing):
+    errors = []
+    for name, (lo, hi) in LISTING_LIMITS.items():
+        value = listing.get(name)
+        if value is not None and not pd.isna(value) and not lo <= value <= hi:
+            errors.append(f"{name} must be between {lo} and {hi}")
+    return errors
+
+# Encode a list of preference names as a bitmask
+def preferences_to_mask(preferences):
+    mask = 0
+    for name in preferences or []:
+        mask |= PREFERENCE_BITS[name]
+    return mask
+
+# Decode a preferences bitmask back into its names
+def preference_labels(mask):
+    return [name for name, bit in PREFERENCE_BITS.items() if int(mask) & bit]
+
+# Comma separated preference names for every possible bitmask
+_PREFERENCE_TEXT = pd.Series([", ".join(preference_labels(mask)) for mask in range(1 << len(PREFERENCE_OPTIONS))])
+
+# Vectorized preference_labels() for a preferences column, joined as text
+def preference_text(preferences):
+    return pd.Series(_PREFERENCE_TEXT.to_numpy()[preferences.to_numpy()], index=preferences.index)
+
+# Bitmask matching any of the given preference names
+def audience_mask(*names):
+    return preferences_to_mask(names)
+
+# Convert raw listing columns (preference lists, 'Yes'/'No' strings, None)
+# into the typed store schema
+def apply_schema(df):
+    df = df.copy()
+    if df['preferences'].dtype == object:
+        df['preferences'] = df['preferences'].map(preferences_to_mask)
+    if df['same_sex_pref'].dtype == object:
+        df['same_sex_pref'] = df['same_sex_pref'].map({'Yes': True, 'No': False, True: True, False: False})
+    return df[list(SCHEMA)].astype(SCHEMA)
+
+# Seed of the mock listings the app starts with
+MOCK_DATA_SEED = 0
+
+# Rows generated per chunk when streaming large synthetic data sets
+GENERATE_CHUNK_SIZE = 500_000
+
+# Rough residents (thousands) and rent level (1.0 = city average) per
+# district. Residents set a district's share of generated listings.
+DISTRICT_PROFILES = {
+    'Altstadt-Lehel': (21, 1.45),
+    'Ludwigsvorstadt-Isarvorstadt': (51, 1.30),
+    'Maxvorstadt': (52, 1.30),
+    'Schwabing-West': (68, 1.25),
+    'Au-Haidhausen': (62, 1.25),
+    'Sendling': (41, 1.10),
+    'Sendling-Westpark': (60, 1.00),
+    'Schwanthalerhöhe': (30, 1.15),
+    'Neuhausen-Nymphenburg': (99, 1.15),
+    'Moosach': (54, 0.90),
+    'Milbertshofen-Am Hart': (77, 0.90),
+    'Schwabing-Freimann': (81, 1.05),
+    'Bogenhausen': (90, 1.15),
+    'Berg am Laim': (47, 0.95),
+    'Trudering-Riem': (74, 0.95),
+    'Ramersdorf-Perlach': (118, 0.85),
+    'Obergiesing-Fasangarten': (54, 1.00),
+    'Untergiesing-Harlaching': (54, 1.10),
+    'Thalkirchen-Obersendling-Forstenried-Fürstenried-Solln': (97, 1.00),
+    'Hadern': (50, 0.95),
+    'Pasing-Obermenzing': (80, 1.00),
+    'Aubing-Lochhausen-Langwied': (50, 0.85),
+    'Allach-Untermenzing': (34, 0.85),
+    'Feldmoching-Hasenbergl': (63, 0.80),
+    'Laim': (57, 1.00),
+}
+
+# Per listing type, in LISTING_TYPES order: share of listings, median size
+# (m²) and base price (€ per m² and month for rent and sale, € per room and
+# month for shared housing)
+TYPE_SHARES = (0.60, 0.25, 0.15)
+TYPE_MEDIAN_SIZE = (60.0, 90.0, 85.0)
+TYPE_BASE_PRICE = (20.0, 22.0, 650.0)
+
+# Range of generated prices. The guide flows' defaults, the location
+# visualizer's price slider and the house assessment all work on this one
+# monthly scale, whatever the listing type.
+MOCK_PRICE_RANGE = (500, 3000)
+
+# Chance of each preference bit (PREFERENCE_OPTIONS order) per listing type
+TYPE_PREFERENCE_ODDS = np.array([
+    [0.40, 0.60, 0.35, 0.20],
+    [0.10, 0.50, 0.70, 0.20],
+    [0.90, 0.40, 0.05, 0.10],
+])
+
+# Listing columns for the given region codes (positions in district_centers),
+# with ids from start_id on. Everything is drawn from rng in whole-column
+# operations: prices follow the district's rent level and the listing's
+# size within MOCK_PRICE_RANGE, shared-housing details are only set for
+# shared housing.
+def _generate_listings(rng, regions, start_id):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    count = len(regions)
+    names = list(district_centers)
+    centers = np.array([district_centers[name] for name in names])
+    levels = np.array([DISTRICT_PROFILES[name][1] for name in names])[regions]
+    ids = np.arange(start_id, start_id + count, dtype=np.int64)
+
+    types = rng.choice(len(LISTING_TYPES), size=count, p=TYPE_SHARES).astype(np.int8)
+    shared = types == LISTING_TYPES.index('Shared Housing')
+    size = np.clip(np.round(np.array(TYPE_MEDIAN_SIZE)[types] * rng.lognormal(0.0, 0.35, count)), 15, 250)
+    noise = rng.lognormal(0.0, 0.15, count)
+    per_size = np.array(TYPE_BASE_PRICE)[types] * levels * noise
+    price = np.clip(np.round(np.where(shared, per_size, per_size * size)), *MOCK_PRICE_RANGE)
+
+    # Better connected towards the center, where rents are higher
+    transportation = np.clip(np.round(rng.normal(2 + 4 * levels, 1.5)), 1, 9)
+
+    # Preferences as independent bits; listings without any get "No preference"
+    bits = rng.random((count, len(PREFERENCE_OPTIONS))) < TYPE_PREFERENCE_ODDS[types]
+    preferences = bits @ (1 << np.arange(len(PREFERENCE_OPTIONS)))
+    preferences[preferences == 0] = PREFERENCE_BITS['No preference']
+
+    # Scattered around the district center, denser in the middle
+    offsets = np.clip(rng.normal(0.0, 0.005, (count, 2)), -0.015, 0.015)
+    lat, lon = (centers[regions] + offsets).T
+
+    current_people = rng.integers(1, 5, count)
+    max_people = np.minimum(current_people + rng.integers(0, 3, count) + 1, 8)
+    region_names = pa.array(names).take(pa.array(regions))
+    return pd.DataFrame({
+        'id': ids,
+        'price': price.astype(np.int32),
+        'transportation': transportation.astype(np.int8),
+        'shared_living': shared | (rng.random(count) < 0.2),
+        'lat': lat,
+        'lon': lon,
+        'region': pd.Categorical.from_codes(regions, dtype=SCHEMA['region']),
+        'address': pd.arrays.ArrowStringArray(pc.binary_join_element_wise(region_names, pa.array(ids).cast(pa.string()), " Street ")),
+        'type': pd.Categorical.from_codes(types, dtype=SCHEMA['type']),
+        'size': size.astype(np.int32),
+        'preferences': preferences.astype(np.uint8),
+        'proximity_schools': rng.random(count) < 0.5,
+        'proximity_parks': rng.random(count) < 0.6,
+        'owner_name': pd.arrays.ArrowStringArray(pc.binary_join_element_wise("Owner ", pa.array(rng.integers(1, 5000, count)).cast(pa.string()), "")),
+        'gender': pd.Categorical.from_codes(np.where(shared, rng.integers(0, len(GENDERS), count), -1), dtype=SCHEMA['gender']),
+        'is_student': pd.arrays.BooleanArray(rng.random(count) < 0.6, ~shared),
+        'current_people': pd.arrays.IntegerArray(current_people.astype(np.int8), ~shared),
+        'max_people': pd.arrays.IntegerArray(max_people.astype(np.int8), ~shared),
+        'same_sex_pref': pd.arrays.BooleanArray(rng.random(count) < 0.3, ~shared),
+    }).astype(SCHEMA)
+
+# count synthetic listings spread over the districts by population, as a
+# typed frame. The same seed and count give the same listings.
+def generate_listings(count, seed=MOCK_DATA_SEED, start_id=1):
+    rng = np.random.default_rng(seed)
+    residents = np.array([DISTRICT_PROFILES[name][0] for name in district_centers], dtype=float)
+    return _generate_listings(rng, rng.choice(len(residents), size=count, p=residents / residents.sum()), start_id)
+
+# generate_listings() in frames of at most chunk_size rows, for data sets
+# that should not be held in memory at once. Chunk i is drawn from its own
+# child seed, so the output only depends on seed, count and chunk_size.
+def iter_listing_chunks(count, chunk_size=GENERATE_CHUNK_SIZE, seed=MOCK_DATA_SEED, start_id=1):
+    seeds = np.random.SeedSequence(seed).spawn(-(-count // chunk_size))
+    for i, chunk_seed in enumerate(seeds):
+        start = i * chunk_size
+        yield generate_listings(min(chunk_size, count - start), chunk_seed, start_id + start)
+
+# Stream count synthetic listings to a Parquet file, one row group per
+# chunk. Returns the number of rows written.
+def write_listings_parquet(path, count, chunk_size=GENERATE_CHUNK_SIZE, seed=MOCK_DATA_SEED):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for chunk in iter_listing_chunks(count, chunk_size, seed):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+# Listings written by write_listings_parquet(), as a typed frame
+def read_listings_parquet(path):
+    return apply_schema(pd.read_parquet(path))
+
+# The mock listings the app is seeded with: houses_per_district in every district
+def generate_mock_data(houses_per_district=40, seed=MOCK_DATA_SEED):
+    regions = np.repeat(np.arange(len(district_centers)), houses_per_district)
+    return _generate_listings(np.random.default_rng(seed), regions, 1)
+
+# Seconds between checks for listings added by other processes
+STORE_SYNC_INTERVAL = 5.0
+
+# Shared, read-mostly listing store.
+# The base frame is built once per process and never mutated; listings offered
+# by users go into an append-only delta that is merged into a new frame
+# lazily, so readers always see an immutable snapshot.
+# With a repository, listings are written to the database first and the
+# delta is filled from it, which also picks up other processes' listings.
+class ListingStore():
+    def __init__(self, base, repository=None):
+        self._lock = threading.Lock()
+        self.repository = repository
+        self._last_id = int(base['id'].max()) if len(base) > 0 else 0
+        self._synced_at = time.monotonic()
+        self._base = base
+        self._delta = []
+        self._merged = 0
+        self._frame = base
+        self._index = None
+        self._spatial_index = None
+        self._next_id = int(base['id'].max()) + 1 if len(base) > 0 else 1
+        self.version = 0
+        # Per-partition versions, e.g. ('type', 'Rent') or ('region', 'Laim')
+        self._partition_versions = {}
+
+    # Current snapshot of all listings (base + delta). Treat it as read-only.
+    def frame(self):
+        with self._lock:
+            if self._merged < len(self._delta):
+                pending = apply_schema(pd.DataFrame(self._delta[self._merged:]))
+                self._frame = pd.concat([self._frame, pending], ignore_index=True)
+                self._merged = len(self._delta)
+            return self._frame
+
+    # Secondary indexes over the current snapshot. Built once, then extended
+    # with the appended rows whenever the delta grows.
+    def index(self):
+        frame = self.frame()
+        with self._lock:
+            if self._index is None:
+                self._index = ListingIndex(frame)
+            elif self._index.frame is not frame:
+                self._index = self._index.extended(frame)
+            return self._index
+
+    # Spatial index over the lat/lon of the current snapshot; positions match frame()
+    def spatial_index(self):
+        frame = self.frame()
+        with self._lock:
+            if self._spatial_index is None:
+                self._spatial_index = SpatialIndex(frame['lat'], frame['lon'])
+            elif len(self._spatial_index) < len(frame):
+                added = frame.iloc[len(self._spatial_index):]
+                self._spatial_index = self._spatial_index.extended(added['lat'], added['lon'])
+            return self._spatial_index
+
+    def _append(self, listing):
+        self._delta.append(listing)
+        self._last_id = max(self._last_id, int(listing['id']))
+        self.version += 1
+        for key in (('type', listing.get('type')), ('region', listing.get('region'))):
+            self._partition_versions[key] = self._partition_versions.get(key, 0) + 1
+
+    # Append a listing to the delta layer and return its id. Raises
+    # ValueError for values outside LISTING_LIMITS.
+    def add_listing(self, listing):
+        errors = listing_errors(listing)
+        if errors:
+            raise ValueError("; ".join(errors))
+        if self.repository is None:
+            with self._lock:
+                listing = dict(listing, id=self._next_id)
+                self._next_id += 1
+                self._append(listing)
+                return listing['id']
+        # Normalize form values ('Yes'/'No', preference lists) to the stored types
+        typed = apply_schema(pd.DataFrame([dict(listing, id=0)])).to_dict('records')[0]
+        del typed['id']
+        listing_id = self.repository.add(typed)
+        self.sync()
+        return listing_id
+
+    # Pull listings added to the repository since the last sync, including
+    # ones written by other processes. Only ids above the highest one seen are
+    # fetched, which relies on ids being committed in increasing order: true
+    # for SQLite, which serializes writers, but not for databases with
+    # concurrent writers, where a row committed after one with a higher id is
+    # never picked up by processes that are already running.
+    def sync(self):
+        if self.repository is None:
+            return
+        with self._lock:
+            for listing in self.repository.frame(after_id=self._last_id).to_dict('records'):
+                self._append(listing)
+            self._synced_at = time.monotonic()
+
+    # sync() at most every STORE_SYNC_INTERVAL seconds
+    def maybe_sync(self):
+        if time.monotonic() - self._synced_at >= STORE_SYNC_INTERVAL:
+            self.sync()
+
+    # Rows of the current snapshot with the given ids, in the order asked for.
+    # Unknown ids are skipped. Ids only grow, so the id column is sorted.
+    def by_ids(self, ids):
+        frame = self.frame()
+        column = frame['id'].to_numpy()
+        ids = np.asarray(ids, dtype=np.int64)
+        positions = np.searchsorted(column, ids).clip(0, max(len(column) - 1, 0))
+        found = column[positions] == ids if len(column) else np.zeros(len(ids), dtype=bool)
+        return frame.iloc[positions[found]]
+
+    # Version counter of a ('type', value) / ('region', value) partition.
+    # It only changes when a listing is added to that partition.
+    def partition_version(self, key):
+        return self._partition_versions.get(key, 0)
+
+    def __len__(self):
+        return len(self._base) + len(self._delta)
+
+_store = None
+_store_lock = threading.Lock()
+
+# Listing store backed by a storage's listings table. An empty database is
+# seeded with the mock listings in one batched write. The table is read in
+# chunks, so only one chunk of untyped rows is in memory next to the typed
+# frame being built.
+def load_store(storage):
+    repository = storage.listings
+    if repository.count() == 0:
+        try:
+            repository.add_many(generate_mock_data().to_dict('records'))
+        except IntegrityError:
+            # Another process seeded it first
+            pass
+    chunks = [apply_schema(chunk) for chunk in repository.iter_frames()]
+    base = pd.concat(chunks, ignore_index=True) if chunks else apply_schema(repository.frame())
+    return ListingStore(base, repository)
+
+# Process-wide listing store, loaded on first use and shared by all sessions
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = load_store(get_storage())
+    _store.maybe_sync()
+    return _store
@@ -0,0 +1,236 @@
+import functools
+import html
+import threading
+import numpy as np
+import branca
+import folium
+from streamlit_folium import generate_leaflet_string, st_folium
+from listing_index import SpatialIndex
+from listings import district_centers
+from metrics import timed
+
+# Center and zoom of the district overview map
+OVERVIEW_CENTER = [48.1374, 11.5755]
+OVERVIEW_ZOOM = 12
+
+# Zoom used for the district drill-down when the map has not reported one yet
+DISTRICT_ZOOM = 14
+
+# Grid cell edge in pixels; points sharing a cell are merged into one cluster
+CLUSTER_CELL_PIXELS = 64
+
+# Upper bound on individual house markers sent to the browser per map
+MAX_HOUSE_MARKERS = 150
+
+# Cells with at most this many houses are shown as individual markers
+EXPAND_CELL_MAX = 3
+
+# Map clicks within this many meters of a district center select the district
+DISTRICT_CLICK_METERS = 500
+
+# Map clicks within this many meters of a house select it
+HOUSE_CLICK_METERS = 5
+
+# Fraction of the viewport added on every side before clustering, so small
+# pans do not immediately need new data
+VIEWPORT_PADDING = 0.5
+
+# Grid cell size in degrees for a Web Mercator zoom level
+def cell_degrees(zoom, cell_pixels=CLUSTER_CELL_PIXELS):
+    return 360.0 / (256 * 2 ** zoom) * cell_pixels
+
+# Bounds (south, west, north, east) grown by VIEWPORT_PADDING on every side
+def padded_bounds(bounds, padding=VIEWPORT_PADDING):
+    south, west, north, east = bounds
+    dlat, dlon = (north - south) * padding, (east - west) * padding
+    return south - dlat, west - dlon, north + dlat, east + dlon
+
+# Whether bounds lie completely inside other bounds
+def bounds_within(inner, outer):
+    return inner[0] >= outer[0] and inner[1] >= outer[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+# Viewport bounds reported by st_folium as (south, west, north, east)
+def output_bounds(map_output):
+    bounds = map_output.get('bounds') or {}
+    south_west, north_east = bounds.get('_southWest') or {}, bounds.get('_northEast') or {}
+    if south_west.get('lat') is None or north_east.get('lat') is None:
+        return None
+    return south_west['lat'], south_west['lng'], north_east['lat'], north_east['lng']
+
+# Group points into a zoom-dependent lat/lon grid.
+# Returns (clusters, singles): clusters is a dict of lat/lon/count arrays for
+# the aggregated cells, singles the positions of points that get their own
+# marker. Points outside the (padded) viewport bounds are dropped and sparse
+# cells are expanded to individual markers while the marker budget lasts, so
+# the payload is bounded by the number of visible cells, not the house count.
+def cluster_points(lat, lon, zoom, bounds=None, max_markers=MAX_HOUSE_MARKERS, expand_max=EXPAND_CELL_MAX):
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    visible = np.arange(len(lat))
+    if bounds is not None:
+        south, west, north, east = padded_bounds(bounds)
+        visible = np.flatnonzero((lat >= south) & (lat <= north) & (lon >= west) & (lon <= east))
+        lat, lon = lat[visible], lon[visible]
+    empty = {'lat': np.empty(0), 'lon': np.empty(0), 'count': np.empty(0, dtype=np.int64)}
+    if len(lat) <= max_markers:
+        return empty, visible
+
+    size = cell_degrees(zoom)
+    rows = np.floor(lat / size).astype(np.int64)
+    cols = np.floor(lon / size).astype(np.int64)
+    rows -= rows.min()
+    cols -= cols.min()
+    _, cell_of, counts = np.unique(rows * (cols.max() + 1) + cols, return_inverse=True, return_counts=True)
+
+    # Expand the sparsest cells first until the marker budget is used up
+    expanded = np.zeros(len(counts), dtype=bool)
+    sparse = np.flatnonzero(counts <= expand_max)
+    sparse = sparse[np.argsort(counts[sparse], kind='stable')]
+    budget = np.cumsum(counts[sparse]) <= max_markers
+    expanded[sparse[budget]] = True
+
+    singles = visible[expanded[cell_of]]
+    grouped = ~expanded
+    clusters = {
+        'lat': (np.bincount(cell_of, weights=lat) / counts)[grouped],
+        'lon': (np.bincount(cell_of, weights=lon) / counts)[grouped],
+        'count': counts[grouped],
+    }
+    return clusters, singles
+
+# Style of the district count badges
+COUNT_BADGE_STYLE = (
+    "font-size: 18px; font-weight: bold; color: black; text-align: center; background: white; "
+    "border-radius: 50%; border: 2px solid blue; width: 35px; height: 35px; line-height: 35px;"
+)
+
+# Spatial index over the district centers, in district_centers order
+@functools.lru_cache(maxsize=1)
+def district_spatial_index():
+    centers = np.array(list(district_centers.values()))
+    return SpatialIndex(centers[:, 0], centers[:, 1])
+
+# District whose center is closest to a map click, or None if the click is too far from all
+def district_at(lat, lon, max_distance=DISTRICT_CLICK_METERS):
+    hit = district_spatial_index().nearest(lat, lon, max_distance)
+    if hit is None:
+        return None
+    return list(district_centers)[hit[0]]
+
+# Id of the house marker closest to a map click, or None if no marker is
+# within max_distance. The click is resolved through the store's spatial
+# index; only ids in drawn_ids (the individual markers on the map, not the
+# houses aggregated into clusters or hidden by the filters) can be picked.
+def house_at(store, drawn_ids, lat, lon, max_distance=HOUSE_CLICK_METERS):
+    positions = store.spatial_index().within(lat, lon, max_distance)
+    ids = store.frame()['id'].to_numpy()[positions]
+    ids = ids[np.isin(ids, drawn_ids)]
+    return int(ids[0]) if len(ids) else None
+
+# Base maps are cached and shared by all sessions; st_folium temporarily
+# attaches the data layer to them, so rendering is serialized
+_render_lock = threading.Lock()
+
+# Bring a base map into the state st_folium leaves it in. The first renders
+# rename folium's element ids and add layer hook-ups; doing that up front
+# keeps the script identical on every later rerun.
+def settle_map(base_map):
+    for _ in range(2):
+        base_map.render()
+        generate_leaflet_string(base_map)
+    return base_map
+
+# Static district overview: tiles and one circle per district. Built once per process.
+@timed("map_base")
+@functools.lru_cache(maxsize=1)
+def district_base_map():
+    district_map = folium.Map(location=OVERVIEW_CENTER, zoom_start=OVERVIEW_ZOOM)
+    for district, center in district_centers.items():
+        folium.CircleMarker(
+            location=center,
+            radius=15,
+            color='blue',
+            fill=True,
+            fill_color='blue',
+            fill_opacity=0.6,
+            tooltip=district,
+        ).add_to(district_map)
+    return settle_map(district_map)
+
+# Static base map of a district drill-down (tiles only), cached per district
+@timed("map_base")
+@functools.lru_cache(maxsize=len(district_centers))
+def district_detail_base_map(district):
+    return settle_map(folium.Map(location=district_centers[district], zoom_start=DISTRICT_ZOOM))
+
+# Data layer of the overview: the per-district house counts as badges
+@timed("map_layer")
+def district_count_layer(counts):
+    layer = folium.FeatureGroup(name="district counts")
+    for district, center in district_centers.items():
+        count = int(counts.get(district, 0))
+        folium.Marker(
+            location=center,
+            tooltip=f"{district}: {count}",
+            icon=folium.DivIcon(
+                icon_size=(35, 35),
+                icon_anchor=(17.5, 17.5),
+                html=f'<div style="{COUNT_BADGE_STYLE}">{count}</div>',
+            ),
+        ).add_to(layer)
+    return layer
+
+# Show a cached base map with a per-rerun data layer.
+# As long as the base map is unchanged the browser keeps it and only swaps
+# the layer; the layer is detached again so the cached map stays clean.
+# Folium accumulates render output on the root figure, so the map gets a
+# fresh one every time to keep its script (and the component key) stable.
+@timed("map_render")
+def st_folium_layered(base_map, layer, key, **kwargs):
+    with _render_lock:
+        try:
+            branca.element.Figure().add_child(base_map)
+            return st_folium(base_map, feature_group_to_add=layer, key=key, **kwargs)
+        finally:
+            base_map._children.pop(layer.get_name(), None)
+
+# Add one circle per cluster, sized by the number of houses it holds
+def add_cluster_markers(parent, clusters):
+    for lat, lon, count in zip(clusters['lat'], clusters['lon'], clusters['count']):
+        folium.CircleMarker(
+            location=[lat, lon],
+            radius=float(8 + 4 * np.log2(count)),
+            color='blue',
+            fill=True,
+            fill_color='blue',
+            fill_opacity=0.5,
+            tooltip=f"{count} houses (click to zoom in)",
+        ).add_to(parent)
+
+# Add a marker with a details popup for each house. The address comes from
+# the offer form, so it is escaped like in the listing cards.
+def add_house_markers(parent, houses):
+    for house in houses.itertuples(index=False):
+        popup_html = f"""
+            <b>House ID:</b> {house.id}<br>
+            <b>Price:</b> €{house.price}<br>
+            <b>Transport Score:</b> {house.transportation}<br>
+            <b>Shared Living:</b> {'Yes' if house.shared_living else 'No'}<br>
+            <b>Address:</b> {html.escape(str(house.address))}<br>
+        """
+        folium.Marker(
+            location=[house.lat, house.lon],
+            popup=folium.Popup(popup_html, max_width=300),
+            tooltip=f"House ID: {house.id}"
+        ).add_to(parent)
+
+# Data layer of the district drill-down: clusters for dense areas, markers for
+# the rest. Returns the layer, the clusters and the ids of the houses that
+# got their own marker.
+@timed("map_layer")
+def district_house_layer(houses, zoom, bounds=None):
+    layer = folium.FeatureGroup(name="houses")
+    clusters, singles = cluster_points(houses['lat'].to_numpy(), houses['lon'].to_numpy(), zoom, bounds)
+    add_cluster_markers(layer, clusters)
+    add_house_markers(layer, houses.iloc[singles])
+    return layer, clusters, houses['id'].to_numpy()[singles]
@@ -0,0 +1,121 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from chat_context import count_tokens
+
+# Tokens of verbatim history sent with every question; above this, older
+# turns are folded into the summary
+HISTORY_TOKEN_BUDGET = 1200
+
+# Tokens of the most recent history kept verbatim when older turns are folded
+RECENT_TOKEN_BUDGET = 400
+
+# Target length of the rolling summary in words
+SUMMARY_WORDS = 150
+
+# Failed summaries are logged here; the turns then stay verbatim until the
+# next attempt
+logger = logging.getLogger("speedy_home.memory")
+
+# Summaries run here, off the request path; shared by all sessions
+_summary_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="summarize")
+
+# Conversation history of one chat: both sides of every turn plus a rolling
+# summary of the turns that no longer fit the token budget.
+# Once the verbatim history exceeds `budget`, all but the most recent
+# `recent` tokens are handed to `summarize(summary, messages) -> str` in the
+# background. Until it finishes the prompt still uses the old summary, with
+# the oldest messages dropped from the window so the prompt stays bounded.
+class ConversationMemory():
+    def __init__(self, summarize=None, budget=HISTORY_TOKEN_BUDGET, recent=RECENT_TOKEN_BUDGET):
+        self.summarize = summarize
+        self.budget = budget
+        self.recent = recent
+        self.summary = ""
+        self._lock = threading.Lock()
+        self._messages = []
+        self._tokens = []
+        self._pending = None
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __bool__(self):
+        return bool(self._messages or self.summary)
+
+    @property
+    def messages(self):
+        return list(self._messages)
+
+    # Tokens of the verbatim history
+    @property
+    def tokens(self):
+        return sum(self._tokens)
+
+    def add_turn(self, prompt, answer):
+        # LangChain is only loaded once a conversation has its first turn
+        from langchain_core.messages import AIMessage, HumanMessage
+        with self._lock:
+            for message in (HumanMessage(prompt), AIMessage(answer)):
+                self._messages.append(message)
+                self._tokens.append(count_tokens(message.content))
+        self._maybe_compact()
+
+    def clear(self):
+        with self._lock:
+            self._messages, self._tokens, self.summary = [], [], ""
+
+    # Messages for the prompt's history placeholder: the summary, then as many
+    # of the latest messages as fit the budget
+    def window(self):
+        with self._lock:
+            start, used = len(self._messages), 0
+            while start > 0 and used + self._tokens[start - 1] <= self.budget:
+                start -= 1
+                used += self._tokens[start]
+            messages = self._messages[start:]
+            if self.summary:
+                from langchain_core.messages import SystemMessage
+                messages = [SystemMessage(f"Summary of the earlier conversation: {self.summary}")] + messages
+            return messages
+
+    # Hand everything but the recent messages to the summarizer
+    def _maybe_compact(self):
+        if self.summarize is None:
+            return
+        with self._lock:
+            if self._pending is not None or sum(self._tokens) <= self.budget:
+                return
+            keep, used = len(self._messages), 0
+            while keep > 0 and used + self._tokens[keep - 1] <= self.recent:
+                keep -= 1
+                used += self._tokens[keep]
+            # Fold whole turns only
+            keep -= keep % 2
+            if keep == 0:
+                return
+            folded = self._messages[:keep]
+            self._pending = _summary_pool.submit(self._compact, self.summary, folded)
+
+    def _compact(self, summary, folded):
+        try:
+            summary = self.summarize(summary, folded)
+        except Exception:
+            logger.exception("summarizing %d messages failed", len(folded))
+            with self._lock:
+                self._pending = None
+            return
+        with self._lock:
+            # clear() may have run meanwhile; only drop what is still there
+            if self._messages[:len(folded)] == folded:
+                del self._messages[:len(folded)]
+                del self._tokens[:len(folded)]
+                self.summary = summary
+            self._pending = None
+        self._maybe_compact()
+
+    # Wait for a running summary (for benchmarks and shutdown)
+    def wait(self, timeout=None):
+        pending = self._pending
+        if pending is not None:
+            pending.exception(timeout)
@@ -0,0 +1,229 @@
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Port of the local /metrics endpoint (Prometheus text format); unset keeps it off
+METRICS_PORT_ENV = "SPEEDY_HOME_METRICS_PORT"
+
+# Histogram buckets: seconds, emitted elements and payload bytes
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+BYTE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 20_000_000)
+
+# Every page run is logged here at DEBUG level, for setups without a scraper
+logger = logging.getLogger("speedy_home.metrics")
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{str(value)}"' for name, value in labels) + "}"
+
+def _number(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+# Monotonic counter with labels
+class Counter():
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, value=1, **labels):
+        key = tuple((name, labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def value(self, **labels):
+        return self._values.get(tuple((name, labels[name]) for name in self.labelnames), 0)
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(key)} {_number(value)}")
+        return lines
+
+# Histogram with fixed buckets and labels; keeps counts, not samples
+class Histogram():
+    def __init__(self, name, help, labelnames=(), buckets=TIME_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [count per bucket (+Inf last), sum]
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = tuple((name, labels[name]) for name in self.labelnames)
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][slot] += 1
+            series[1] += value
+
+    # (count, sum) of a label set
+    def totals(self, **labels):
+        series = self._series.get(tuple((name, labels[name]) for name in self.labelnames))
+        return (sum(series[0]), series[1]) if series else (0, 0.0)
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _number(bound)
+                    lines.append(f"{self.name}_bucket{_label_text(key + (('le', le),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_label_text(key)} {_number(total)}")
+                lines.append(f"{self.name}_count{_label_text(key)} {cumulative}")
+        return lines
+
+# The process's metrics. Besides counters and histograms it polls stats()
+# dicts of components (caches, the LLM dispatcher) when it is scraped, so
+# they only keep their own counters.
+class Registry():
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._stats = []
+
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=TIME_BUCKETS):
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def _add(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    # Publish every numeric field of stats() as a gauge named prefix_field
+    def register_stats(self, prefix, stats, **labels):
+        with self._lock:
+            self._stats.append((prefix, stats, tuple(sorted(labels.items()))))
+
+    def exposition(self):
+        with self._lock:
+            metrics, stats = list(self._metrics.values()), list(self._stats)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.exposition())
+        gauges = {}
+        for prefix, read, labels in stats:
+            for field, value in read().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    gauges.setdefault(f"{prefix}_{field}", []).append(f"{prefix}_{field}{_label_text(labels)} {_number(value)}")
+        for name, samples in sorted(gauges.items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+PAGE_SECONDS = registry.histogram("speedy_home_page_seconds", "Wall time of a page run", ("page",))
+PAGE_ELEMENTS = registry.histogram("speedy_home_page_elements", "Elements a page run sent to the browser", ("page",), COUNT_BUCKETS)
+PAGE_BYTES = registry.histogram("speedy_home_page_payload_bytes", "Serialized size of the elements a page run sent", ("page",), BYTE_BUCKETS)
+PAGE_RUNS = registry.counter("speedy_home_page_runs_total", "Page runs by how they ended (ok, rerun, stop, error)", ("page", "outcome"))
+STAGE_SECONDS = registry.histogram("speedy_home_stage_seconds", "Time spent in an instrumented hot path", ("stage",))
+
+# Time a block as one observation of a stage
+@contextmanager
+def timer(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+# Decorator version of timer()
+def timed(stage):
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with timer(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def _outcome(error):
+    if error is None:
+        return "ok"
+    name = type(error).__name__
+    return {"RerunException": "rerun", "StopException": "stop"}.get(name, "error")
+
+# Run a page and record its wall time, outcome, and the number and
+# serialized size of the elements it emitted. Elements are counted by
+# wrapping the script run's message queue for the duration of the page;
+# outside a Streamlit script run only the time is recorded.
+def record_page(page_name, render):
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx(suppress_warning=True)
+    sent = [0, 0]
+    original = ctx._enqueue if ctx is not None else None
+    if ctx is not None:
+        def enqueue(msg):
+            if msg.HasField("delta"):
+                sent[0] += 1
+                sent[1] += msg.ByteSize()
+            original(msg)
+        ctx._enqueue = enqueue
+    error = None
+    start = time.perf_counter()
+    try:
+        return render()
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        if ctx is not None:
+            ctx._enqueue = original
+            PAGE_ELEMENTS.observe(sent[0], page=page_name)
+            PAGE_BYTES.observe(sent[1], page=page_name)
+        PAGE_SECONDS.observe(elapsed, page=page_name)
+        PAGE_RUNS.inc(page=page_name, outcome=_outcome(error))
+        logger.debug("page=%s outcome=%s seconds=%.4f elements=%d bytes=%d", page_name, _outcome(error), elapsed, sent[0], sent[1])
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.exposition().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+_server_lock = threading.Lock()
+
+# Serve /metrics on localhost in a background thread, once per process.
+# Without a port, METRICS_PORT_ENV decides; returns the server or None.
+def serve_metrics(port=None, host="127.0.0.1"):
+    global _server
+    if _server is None:
+        with _server_lock:
+            if _server is None:
+                port = port if port is not None else os.environ.get(METRICS_PORT_ENV)
+                if not port:
+                    return None
+                _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+                threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    return _server
@@ -0,0 +1,227 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from embeddings import HashingEmbedder, tokenize
+from metrics import registry
+
+# Cached answers older than this are not served (seconds)
+RESPONSE_TTL = 24 * 3600
+
+# Most answers kept per backend
+RESPONSE_CACHE_SIZE = 2000
+
+# Cosine similarity from which a differently worded question counts as the same
+SIMILARITY_THRESHOLD = 0.9
+
+# Set to a file path to keep cached answers in SQLite instead of memory
+RESPONSE_CACHE_ENV = "SPEEDY_HOME_RESPONSE_CACHE"
+
+# Lowercase, drop punctuation and collapse whitespace
+def normalize_prompt(prompt):
+    return " ".join(tokenize(prompt))
+
+# Coarse profile bucket: answers are shared by users with the same job,
+# age decade and income band, not just by identical profiles
+def profile_bucket(user):
+    if not isinstance(user, dict):
+        return "default"
+    age = user.get("age")
+    age_band = f"{age // 10 * 10}s" if isinstance(age, int) else "?"
+    income = user.get("monthly_income") or 0
+    income_band = next(band for limit, band in [(1500, "low"), (3500, "mid"), (float("inf"), "high")] if income < limit)
+    return f"{user.get('job') or '?'}|{age_band}|{income_band}"
+
+# Scope of a cached answer: language, profile bucket and the housing context
+# the answer was given for. Only answers in the same scope are reused.
+def cache_scope(language, user, context):
+    digest = hashlib.sha1(repr(context).encode("utf-8")).hexdigest()[:12] if context else "-"
+    return f"{language}|{profile_bucket(user)}|{digest}"
+
+# In-memory LRU backend
+class MemoryBackend():
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    # (key, vector) of every entry in a scope
+    def vectors(self, scope):
+        with self._lock:
+            return [(key, entry["vector"]) for key, entry in self._entries.items() if entry["scope"] == scope]
+
+    def __len__(self):
+        return len(self._entries)
+
+# SQLite backend, shared by all processes using the same file.
+# LRU order is kept in last_used; the oldest rows are dropped past maxsize.
+class SQLiteBackend():
+    def __init__(self, path, maxsize=RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, scope TEXT, answer TEXT, vector BLOB, "
+            "latency REAL, created REAL, last_used REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_scope ON responses (scope)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._db.commit()
+
+    @staticmethod
+    def _entry(row):
+        scope, answer, vector, latency, created = row
+        return {"scope": scope, "answer": answer, "vector": np.frombuffer(vector, dtype=np.float32), "latency": latency, "created": created}
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT scope, answer, vector, latency, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            return self._entry(row)
+
+    def put(self, key, entry):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, entry["scope"], entry["answer"], np.asarray(entry["vector"], dtype=np.float32).tobytes(),
+                 entry["latency"], entry["created"], time.time()),
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+            self._db.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def vectors(self, scope):
+        with self._lock:
+            rows = self._db.execute("SELECT key, vector FROM responses WHERE scope = ?", (scope,)).fetchall()
+        return [(key, np.frombuffer(vector, dtype=np.float32)) for key, vector in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+# Response cache in front of Bot.ask().
+# Exact hits match the normalized prompt within a scope; when that misses and
+# an embedder is set, the most similar cached question of the same scope is
+# used if it is at least `threshold` similar. Entries expire after `ttl`.
+class ResponseCache():
+    def __init__(self, backend=None, embedder=None, threshold=SIMILARITY_THRESHOLD, ttl=RESPONSE_TTL):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.embedder = embedder
+        self.threshold = threshold
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def _key(scope, normalized):
+        return hashlib.sha1(f"{scope}\n{normalized}".encode("utf-8")).hexdigest()
+
+    def _fresh(self, entry):
+        return entry is not None and time.time() - entry["created"] <= self.ttl
+
+    def _hit(self, entry, semantic):
+        with self._lock:
+            if semantic:
+                self.semantic_hits += 1
+            else:
+                self.exact_hits += 1
+            self.saved_seconds += entry["latency"]
+        return entry["answer"]
+
+    # Cached answer for a question, or None
+    def lookup(self, prompt, language, user, context):
+        scope = cache_scope(language, user, context)
+        normalized = normalize_prompt(prompt)
+        key = self._key(scope, normalized)
+        entry = self.backend.get(key)
+        if self._fresh(entry):
+            return self._hit(entry, semantic=False)
+        if entry is not None:
+            self.backend.delete(key)
+
+        if self.embedder is not None and normalized:
+            candidates = self.backend.vectors(scope)
+            if candidates:
+                keys, vectors = zip(*candidates)
+                similarities = np.stack(vectors) @ self.embedder.embed(normalized)
+                best = int(similarities.argmax())
+                if similarities[best] >= self.threshold:
+                    entry = self.backend.get(keys[best])
+                    if self._fresh(entry):
+                        return self._hit(entry, semantic=True)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    # Remember an answer together with how long the model took for it
+    def store(self, prompt, language, user, context, answer, latency):
+        scope = cache_scope(language, user, context)
+        normalized = normalize_prompt(prompt)
+        vector = self.embedder.embed(normalized) if self.embedder is not None else np.empty(0, dtype=np.float32)
+        self.backend.put(self._key(scope, normalized), {
+            "scope": scope, "answer": answer, "vector": vector, "latency": latency, "created": time.time(),
+        })
+
+    def stats(self):
+        with self._lock:
+            hits = self.exact_hits + self.semantic_hits
+            lookups = hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "saved_seconds": self.saved_seconds,
+                "size": len(self.backend),
+            }
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+# Process-wide response cache; SQLite-backed when RESPONSE_CACHE_ENV is set
+def get_response_cache():
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            path = os.environ.get(RESPONSE_CACHE_ENV)
+            backend = SQLiteBackend(path) if path else MemoryBackend()
+            _response_cache = ResponseCache(backend, embedder=HashingEmbedder())
+            registry.register_stats("speedy_home_cache", _response_cache.stats, cache="response")
+        return _response_cache
@@ -0,0 +1,208 @@
+import math
+import threading
+from collections import Counter, defaultdict
+import numpy as np
+from chat_context import listing_line
+from embeddings import HashingEmbedder, tokenize
+from knowledge import FAQS, GUIDES
+from listings import get_store
+
+# Snippets the assistant gets per question
+RETRIEVAL_TOP_K = 4
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Reciprocal rank fusion constant; larger values flatten the rank weights
+RRF_K = 60
+
+# Weight of the embedding ranking relative to BM25 in the fusion; the offline
+# hashing embedder is a weaker signal than exact term matches
+VECTOR_WEIGHT = 0.3
+
+# Candidates taken from each ranking before fusing
+FUSION_DEPTH = 50
+
+# Listings the index keeps searchable: only the most recently added ones, so
+# building and searching it does not grow with the listing store
+RETRIEVAL_MAX_LISTINGS = 5_000
+
+# Words that carry no meaning for ranking
+STOPWORDS = frozenset("a an and are can do for how i in is it my of on or the to what which with you".split())
+
+def terms(text):
+    return [word for word in tokenize(text) if word not in STOPWORDS]
+
+# Okapi BM25 over an append-only list of documents.
+# Postings, document frequencies and lengths are updated as documents are
+# added, so nothing is rebuilt when the collection grows.
+class BM25Index():
+    def __init__(self, k1=BM25_K1, b=BM25_B):
+        self.k1 = k1
+        self.b = b
+        self._postings = defaultdict(lambda: ([], []))
+        self._lengths = []
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def add(self, texts):
+        for text in texts:
+            doc = len(self._lengths)
+            counts = Counter(terms(text))
+            for term, count in counts.items():
+                docs, frequencies = self._postings[term]
+                docs.append(doc)
+                frequencies.append(count)
+            length = sum(counts.values())
+            self._lengths.append(length)
+            self._total_length += length
+
+    # Scores of all documents for a query (0 for documents sharing no term)
+    def scores(self, query):
+        n = len(self._lengths)
+        scores = np.zeros(n)
+        if n == 0:
+            return scores
+        lengths = np.asarray(self._lengths, dtype=float)
+        norm = self.k1 * (1 - self.b + self.b * lengths / (self._total_length / n or 1))
+        for term in set(terms(query)):
+            if term not in self._postings:
+                continue
+            docs, frequencies = self._postings[term]
+            docs = np.asarray(docs)
+            frequencies = np.asarray(frequencies, dtype=float)
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * frequencies * (self.k1 + 1) / (frequencies + norm[docs])
+        return scores
+
+# Embedding matrix with amortized appends; rows are L2-normalized, so the
+# dot product with a query embedding is the cosine similarity.
+class VectorIndex():
+    def __init__(self, embedder):
+        self.embedder = embedder
+        self._vectors = np.empty((0, embedder.dim), dtype=np.float32)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, texts):
+        vectors = self.embedder.embed_many(list(texts))
+        needed = self._size + len(vectors)
+        if needed > len(self._vectors):
+            grown = np.empty((max(needed, 2 * len(self._vectors)), self.embedder.dim), dtype=np.float32)
+            grown[:self._size] = self._vectors[:self._size]
+            self._vectors = grown
+        self._vectors[self._size:needed] = vectors
+        self._size = needed
+
+    def scores(self, query):
+        return self._vectors[:self._size] @ self.embedder.embed(query)
+
+# Search over the FAQ and guide content and the listing store.
+# Documents are ranked by BM25 and by embedding similarity and the two
+# rankings are combined with reciprocal rank fusion. Listings are indexed
+# incrementally: sync() only adds the rows appended since the last call, and
+# only the latest max_listings of them. Once twice that many are indexed the
+# index is rebuilt from the latest max_listings, so its size stays bounded
+# and each new listing costs amortized constant work.
+class RetrievalIndex():
+    def __init__(self, embedder=None, max_listings=RETRIEVAL_MAX_LISTINGS):
+        self._lock = threading.Lock()
+        self.embedder = embedder if embedder is not None else HashingEmbedder()
+        self.max_listings = max_listings
+        # Store rows seen by sync(), of which the last _indexed are searchable
+        self._listings = 0
+        self._indexed = 0
+        self._reset()
+
+    def __len__(self):
+        return len(self.texts)
+
+    # Start over with only the FAQ and guide content
+    def _reset(self):
+        self.bm25 = BM25Index()
+        self.vectors = VectorIndex(self.embedder)
+        # (source, key) per document, e.g. ('faq', 'What is a mortgage?') or ('listing', 17)
+        self.sources = []
+        self.texts = []
+        self._indexed = 0
+        self._add([(('faq', item["question"]), f"{item['question']} {item['answer']}")
+                   for items in FAQS.values() for item in items])
+        self._add([(('guide', title), f"{title}: {text}") for title, text in GUIDES.items()])
+
+    def _add(self, documents):
+        if not documents:
+            return
+        sources, texts = zip(*documents)
+        self.bm25.add(texts)
+        self.vectors.add(texts)
+        self.sources.extend(sources)
+        self.texts.extend(texts)
+
+    # Index the listings added to the store since the last sync
+    def sync(self, store):
+        frame = store.frame()
+        with self._lock:
+            if len(frame) <= self._listings:
+                return
+            if self._indexed + len(frame) - self._listings > 2 * self.max_listings:
+                self._reset()
+                start = len(frame) - self.max_listings
+            else:
+                start = self._listings
+            added = frame.iloc[max(start, len(frame) - self.max_listings, 0):]
+            self._add([(('listing', int(house.id)), listing_line(house)) for house in added.itertuples(index=False)])
+            self._indexed += len(added)
+            self._listings = len(frame)
+
+    # Document positions ranked by one method ('bm25', 'vector') or both fused ('hybrid')
+    def rank(self, query, k=RETRIEVAL_TOP_K, method='hybrid'):
+        with self._lock:
+            if method == 'bm25':
+                return _top(self.bm25.scores(query), k)
+            if method == 'vector':
+                return _top(self.vectors.scores(query), k)
+            rankings = [
+                (1.0, _top(self.bm25.scores(query), FUSION_DEPTH)),
+                (VECTOR_WEIGHT, _top(self.vectors.scores(query), FUSION_DEPTH)),
+            ]
+            fused = defaultdict(float)
+            for weight, ranking in rankings:
+                for rank, position in enumerate(ranking):
+                    fused[position] += weight / (RRF_K + rank + 1)
+            return sorted(fused, key=fused.get, reverse=True)[:k]
+
+    # Top-k snippets for a query
+    def search(self, query, k=RETRIEVAL_TOP_K, method='hybrid'):
+        return [self.texts[position] for position in self.rank(query, k, method)]
+
+# Positions of the k highest positive scores, best first
+def _top(scores, k):
+    k = min(k, int(np.count_nonzero(scores > 0)))
+    if k == 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')].tolist()
+
+_index = None
+_index_lock = threading.Lock()
+
+# Process-wide retrieval index, built on first use
+def get_retrieval_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = RetrievalIndex()
+    return _index
+
+# Top-k snippets for a question, with the listing store's latest rows indexed
+# (at most RETRIEVAL_MAX_LISTINGS of them)
+def retrieve(question, k=RETRIEVAL_TOP_K):
+    index = get_retrieval_index()
+    index.sync(get_store())
+    return index.search(question, k)
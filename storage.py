@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+import time
+from sqlalchemy import (
+    JSON, Boolean, Column, Float, Index, Integer, MetaData, SmallInteger, String, Table, Text, create_engine, event, func,
+    insert, select,
+)
+
+# Database URL; any SQLAlchemy URL works, e.g. a shared Postgres for several replicas
+DATABASE_URL_ENV = "SPEEDY_HOME_DATABASE_URL"
+DEFAULT_DATABASE_URL = "sqlite:///speedy_home.sqlite"
+
+# Connections kept open per process
+POOL_SIZE = 5
+
+# Rows per INSERT batch
+WRITE_BATCH_SIZE = 1000
+
+metadata = MetaData()
+
+listings_table = Table(
+    "listings", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("price", Integer, nullable=False),
+    Column("transportation", SmallInteger, nullable=False),
+    Column("shared_living", Boolean, nullable=False),
+    Column("lat", Float, nullable=False),
+    Column("lon", Float, nullable=False),
+    Column("region", String(64), nullable=False),
+    Column("address", Text),
+    Column("type", String(32), nullable=False),
+    Column("size", Integer, nullable=False),
+    # Bitmask of listings.PREFERENCE_BITS
+    Column("preferences", SmallInteger, nullable=False),
+    Column("proximity_schools", Boolean, nullable=False),
+    Column("proximity_parks", Boolean, nullable=False),
+    Column("owner_name", Text),
+    Column("gender", String(16)),
+    Column("is_student", Boolean),
+    Column("current_people", SmallInteger),
+    Column("max_people", SmallInteger),
+    Column("same_sex_pref", Boolean),
+    Column("created_at", Float, nullable=False),
+    Index("listings_type_price", "type", "price"),
+    Index("listings_region", "region"),
+    Index("listings_size", "size"),
+)
+
+profiles_table = Table(
+    "profiles", metadata,
+    Column("id", String(36), primary_key=True),
+    Column("email", String(255), index=True),
+    Column("data", JSON, nullable=False),
+    Column("updated_at", Float, nullable=False),
+)
+
+messages_table = Table(
+    "messages", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("profile_id", String(36), nullable=False),
+    Column("recipient", String(255), nullable=False),
+    Column("body", Text, nullable=False),
+    Column("created_at", Float, nullable=False),
+    Index("messages_conversation", "profile_id", "recipient", "created_at"),
+)
+
+# Houses a profile was assessed for (the assistant's housing context)
+assessments_table = Table(
+    "assessments", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("profile_id", String(36), nullable=False),
+    Column("listing_id", Integer, nullable=False),
+    Column("created_at", Float, nullable=False),
+    Index("assessments_profile", "profile_id", "created_at"),
+)
+
+# Engine with a connection pool; SQLite gets WAL mode so readers in other
+# processes are not blocked by a writer
+def create_storage_engine(url=None):
+    url = url or os.environ.get(DATABASE_URL_ENV, DEFAULT_DATABASE_URL)
+    if url.startswith("sqlite") and ":memory:" not in url and url != "sqlite://":
+        engine = create_engine(url, pool_size=POOL_SIZE, pool_pre_ping=True, connect_args={"check_same_thread": False, "timeout": 30})
+    else:
+        engine = create_engine(url, pool_pre_ping=True)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(connection, record):
+            cursor = connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+    metadata.create_all(engine)
+    return engine
+
+# pandas is imported by the listing methods only: profiles and messages
+# (the pages most sessions start on) do not need it.
+
+# Python scalars for a listing dict (numpy values and pandas NA become plain values/None)
+def _listing_row(listing, now):
+    import pandas as pd
+    row = {column.name: listing.get(column.name) for column in listings_table.columns if column.name not in ("id", "created_at")}
+    for name, value in row.items():
+        if value is not None and pd.isna(value):
+            row[name] = None
+        elif hasattr(value, "item"):
+            row[name] = value.item()
+    if listing.get("id") is not None:
+        row["id"] = int(listing["id"])
+    row["created_at"] = now
+    return row
+
+def _batches(rows, size=WRITE_BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+# Listings table. Preferences are stored as the store's bitmask; frames come
+# back as raw columns for listings.apply_schema().
+class ListingRepository():
+    def __init__(self, engine):
+        self.engine = engine
+
+    def count(self):
+        with self.engine.connect() as connection:
+            return connection.execute(select(func.count()).select_from(listings_table)).scalar_one()
+
+    # Insert one listing and return its id
+    def add(self, listing):
+        with self.engine.begin() as connection:
+            result = connection.execute(insert(listings_table).values(_listing_row(listing, time.time())))
+            return result.inserted_primary_key[0]
+
+    # Insert many listings in batched executemany transactions
+    def add_many(self, listings):
+        now = time.time()
+        rows = [_listing_row(listing, now) for listing in listings]
+        with self.engine.begin() as connection:
+            for batch in _batches(rows):
+                connection.execute(insert(listings_table), batch)
+        return len(rows)
+
+    # Listings with an id above after_id, in id order
+    def frame(self, after_id=0):
+        import pandas as pd
+        query = select(*[c for c in listings_table.columns if c.name != "created_at"]).where(listings_table.c.id > after_id).order_by(listings_table.c.id)
+        with self.engine.connect() as connection:
+            return pd.read_sql(query, connection)
+
+    # The same rows as frame(), chunksize rows at a time
+    def iter_frames(self, chunksize=50_000, after_id=0):
+        import pandas as pd
+        while True:
+            query = (select(*[c for c in listings_table.columns if c.name != "created_at"])
+                     .where(listings_table.c.id > after_id).order_by(listings_table.c.id).limit(chunksize))
+            with self.engine.connect() as connection:
+                chunk = pd.read_sql(query, connection)
+            if chunk.empty:
+                return
+            yield chunk
+            after_id = int(chunk["id"].iloc[-1])
+
+class ProfileRepository():
+    def __init__(self, engine):
+        self.engine = engine
+
+    def get(self, profile_id):
+        with self.engine.connect() as connection:
+            data = connection.execute(select(profiles_table.c.data).where(profiles_table.c.id == profile_id)).scalar_one_or_none()
+        return data
+
+    def save(self, profile_id, profile):
+        # Round-trip through JSON so numpy values and tuples are stored as plain types
+        data = json.loads(json.dumps(profile, default=str))
+        row = {"email": profile.get("email") or None, "data": data, "updated_at": time.time()}
+        with self.engine.begin() as connection:
+            updated = connection.execute(profiles_table.update().where(profiles_table.c.id == profile_id).values(**row)).rowcount
+            if not updated:
+                connection.execute(insert(profiles_table).values(id=profile_id, **row))
+
+class MessageRepository():
+    def __init__(self, engine):
+        self.engine = engine
+
+    def add(self, profile_id, recipient, body):
+        with self.engine.begin() as connection:
+            connection.execute(insert(messages_table).values(profile_id=profile_id, recipient=recipient, body=body, created_at=time.time()))
+
+    # Messages of a profile to a recipient, oldest first, as dicts with recipient/message/created_at
+    def conversation(self, profile_id, recipient, limit=200):
+        query = (select(messages_table.c.recipient, messages_table.c.body, messages_table.c.created_at)
+                 .where(messages_table.c.profile_id == profile_id, messages_table.c.recipient == recipient)
+                 .order_by(messages_table.c.created_at.desc()).limit(limit))
+        with self.engine.connect() as connection:
+            rows = connection.execute(query).all()
+        return [{"recipient": r.recipient, "message": r.body, "created_at": r.created_at} for r in reversed(rows)]
+
+class AssessmentRepository():
+    def __init__(self, engine):
+        self.engine = engine
+
+    def add(self, profile_id, listing_id):
+        with self.engine.begin() as connection:
+            connection.execute(insert(assessments_table).values(profile_id=profile_id, listing_id=int(listing_id), created_at=time.time()))
+
+    # Listing ids a profile was assessed for, oldest first
+    def listing_ids(self, profile_id, limit=100):
+        query = (select(assessments_table.c.listing_id).where(assessments_table.c.profile_id == profile_id)
+                 .order_by(assessments_table.c.created_at.desc()).limit(limit))
+        with self.engine.connect() as connection:
+            return [row.listing_id for row in reversed(connection.execute(query).all())]
+
+# The repositories over one engine
+class Storage():
+    def __init__(self, engine):
+        self.engine = engine
+        self.listings = ListingRepository(engine)
+        self.profiles = ProfileRepository(engine)
+        self.messages = MessageRepository(engine)
+        self.assessments = AssessmentRepository(engine)
+
+_storage = None
+_storage_lock = threading.Lock()
+
+# Process-wide storage, connected on first use
+def get_storage():
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = Storage(create_storage_engine())
+    return _storage
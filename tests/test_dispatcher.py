@@ -0,0 +1,97 @@
+# LLM dispatcher against the offline fake chat model: coalescing, retries,
+# deadlines and the concurrency limit
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import pytest
+from tenacity import wait_none
+from benchmarks.fake_llm import FakeChatModel
+from dispatcher import LLMDispatcher
+
+# Fails with a retryable connection error the first `failures` times
+class FlakyChatModel(FakeChatModel):
+    failures: int = 0
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.failures > 0:
+            self.failures -= 1
+            raise httpx.ConnectError("upstream unavailable")
+        return await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+# Records how many calls run upstream at the same time
+class ConcurrencyChatModel(FakeChatModel):
+    active: int = 0
+    peak: int = 0
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+        finally:
+            self.active -= 1
+
+def dispatcher(**kwargs):
+    return LLMDispatcher(wait=wait_none(), **kwargs)
+
+def run_concurrently(call, inputs):
+    with ThreadPoolExecutor(max_workers=len(inputs)) as pool:
+        return list(pool.map(call, inputs))
+
+def test_identical_calls_are_coalesced():
+    llm = FakeChatModel(first_token_delay=0.3, token_delay=0.0)
+    calls = dispatcher()
+    answers = run_concurrently(lambda prompt: calls.invoke(llm, prompt).content, ["How much deposit?"] * 8)
+    assert answers == [llm.response] * 8
+    assert llm.calls == 1
+    assert calls.stats()["coalesced"] == 7
+
+def test_transient_errors_are_retried():
+    llm = FlakyChatModel(failures=2, first_token_delay=0.0, token_delay=0.0)
+    calls = dispatcher(attempts=3)
+    assert calls.invoke(llm, "How much deposit?").content == llm.response
+    assert calls.stats()["retries"] == 2 and calls.stats()["failures"] == 0
+
+def test_errors_beyond_the_attempts_are_raised():
+    llm = FlakyChatModel(failures=5, first_token_delay=0.0, token_delay=0.0)
+    calls = dispatcher(attempts=3)
+    with pytest.raises(httpx.ConnectError):
+        calls.invoke(llm, "How much deposit?")
+    assert calls.stats()["retries"] == 2 and calls.stats()["failures"] == 1
+
+def test_calls_time_out_at_the_deadline():
+    llm = FakeChatModel(first_token_delay=2.0, token_delay=0.0)
+    calls = dispatcher()
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        calls.invoke(llm, "How much deposit?", deadline=0.2)
+    assert time.perf_counter() - start < 1.0
+    assert calls.stats()["timeouts"] == 1
+
+def test_the_deadline_covers_the_whole_stream():
+    llm = FakeChatModel(response=" ".join(["word"] * 50), first_token_delay=0.0, token_delay=0.02)
+    calls = dispatcher()
+    chunks = []
+    with pytest.raises(TimeoutError):
+        for chunk in calls.stream(llm, "How much deposit?", deadline=0.3):
+            chunks.append(chunk)
+    assert 0 < len(chunks) < 50
+
+def test_abandoned_streams_free_their_slot():
+    llm = FakeChatModel(response=" ".join(["word"] * 50), first_token_delay=0.0, token_delay=0.02)
+    calls = dispatcher(max_concurrency=1)
+    stream = calls.stream(llm, "How much deposit?")
+    next(stream)
+    stream.close()
+    time.sleep(0.1)
+    assert calls.stats()["in_flight"] == 0
+    # The slot is free again for the next caller
+    assert len(list(calls.stream(llm, "How much deposit?", deadline=5.0))) == 50
+
+def test_concurrency_is_limited():
+    llm = ConcurrencyChatModel(first_token_delay=0.1, token_delay=0.0)
+    calls = dispatcher(max_concurrency=3)
+    answers = run_concurrently(lambda prompt: calls.invoke(llm, prompt).content, [f"Question {i}" for i in range(12)])
+    assert answers == [llm.response] * 12
+    assert llm.peak == 3
+    assert calls.stats()["max_queue_depth"] > 0 and calls.stats()["in_flight"] == 0
@@ -0,0 +1,103 @@
+# The vectorized amortization engine against a straightforward
+# period-by-period loop and the basic amortization invariants, and the
+# scenario simulation and its cache
+import numpy as np
+import pandas as pd
+import pytest
+from finance import PERIODS_PER_YEAR, ScenarioCache, amortization_schedule, annuity_payment, scenario_grid, simulate_loans
+
+# Reference schedule of a single loan, one period at a time
+def reference_schedule(principal, annual_rate, years):
+    r = annual_rate / 100 / PERIODS_PER_YEAR
+    n = round(years * PERIODS_PER_YEAR)
+    payment = principal / n if r == 0 else principal * r / (1 - (1 + r) ** -n)
+    balance, rows = principal, []
+    for period in range(n):
+        interest = balance * r
+        repaid = balance if period == n - 1 else payment - interest
+        balance -= repaid
+        rows.append((interest, repaid, balance))
+    return payment, np.array(rows).T
+
+# Random loans, about 5% of them interest-free
+@pytest.fixture(scope="module")
+def loans():
+    rng = np.random.default_rng(0)
+    count = 200
+    principal = rng.uniform(10_000, 2_000_000, count)
+    rate = np.where(rng.random(count) < 0.05, 0.0, rng.uniform(0.1, 12, count))
+    years = rng.integers(1, 41, count)
+    return principal, rate, years, amortization_schedule(principal, rate, years)
+
+def test_schedule_matches_reference_loop(loans):
+    principal, rate, years, schedule = loans
+    for i in range(len(principal)):
+        payment, (interest, repaid, balance) = reference_schedule(principal[i], rate[i], years[i])
+        n = len(interest)
+        assert schedule.periods[i] == n
+        assert np.isclose(schedule.payment[i], payment)
+        np.testing.assert_allclose(schedule.interest[i, :n], interest, rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(schedule.principal[i, :n], repaid, rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(schedule.balance[i, :n], balance, rtol=1e-9, atol=1e-4)
+        # Nothing is paid after the last period
+        assert not schedule.interest[i, n:].any() and not schedule.principal[i, n:].any()
+
+def test_loans_are_repaid_exactly(loans):
+    principal, _, _, schedule = loans
+    np.testing.assert_allclose(schedule.principal.sum(axis=1), principal)
+    np.testing.assert_allclose(schedule.total_paid, schedule.payment * schedule.periods, rtol=1e-9)
+
+def test_zero_rate_loan_repays_in_equal_parts():
+    schedule = amortization_schedule(np.array([120_000.0]), np.array([0.0]), 10)
+    assert schedule.payment[0] == pytest.approx(1_000)
+    assert not schedule.interest.any()
+
+def test_textbook_monthly_payment():
+    # 100k at 3% over 20 years costs €554.60 a month
+    assert round(float(annuity_payment(100_000, 3.0, 20)), 2) == 554.60
+
+def test_simulation_without_extras_matches_schedule(loans):
+    principal, rate, years, schedule = loans
+    simulated = simulate_loans(principal, rate, years)
+    np.testing.assert_allclose(simulated['payment'], schedule.payment)
+    np.testing.assert_allclose(simulated['total_interest'], schedule.total_interest, rtol=1e-9, atol=1e-6)
+    np.testing.assert_array_equal(simulated['payoff_years'], years)
+    assert not simulated['balance_at_refinance'].any()
+
+def test_special_repayment_shortens_the_loan():
+    plain = simulate_loans(400_000, 4.0, 30)
+    special = simulate_loans(400_000, 4.0, 30, special_repayment=5.0)
+    assert special['payoff_years'][0] < plain['payoff_years'][0] == 30
+    assert special['total_interest'][0] < plain['total_interest'][0]
+    np.testing.assert_allclose(special['payment'], plain['payment'])
+
+def test_balance_at_refinance_is_the_scheduled_balance():
+    principal, rate, years, fixed_years = 300_000, 3.5, 25, 10
+    schedule = amortization_schedule(principal, rate, years)
+    simulated = simulate_loans(principal, rate, years, fixed_years=fixed_years, refinance_rate=rate)
+    expected = schedule.balance[0, fixed_years * PERIODS_PER_YEAR - 1]
+    assert simulated['balance_at_refinance'][0] == pytest.approx(expected)
+    # Refinancing at the same rate keeps the payment, so the cost is unchanged
+    assert simulated['total_interest'][0] == pytest.approx(schedule.total_interest[0])
+    assert simulated['payoff_years'][0] == years
+
+def test_higher_refinance_rate_costs_more():
+    fixed = simulate_loans(300_000, 3.5, 25)
+    refinanced = simulate_loans(300_000, 3.5, 25, fixed_years=10, refinance_rate=6.0)
+    assert refinanced['total_interest'][0] > fixed['total_interest'][0]
+
+def test_scenario_cache_reuses_cells():
+    cache = ScenarioCache()
+    down_payments, rates, terms = [0, 50_000], [3.0, 4.0], [20, 30]
+    first = scenario_grid(500_000, down_payments, rates, terms, cache=cache)
+    assert cache.stats()['misses'] == len(first) and cache.stats()['hits'] == 0
+
+    # One more term: only its cells are simulated
+    second = scenario_grid(500_000, down_payments, rates, terms + [25], cache=cache)
+    assert cache.stats()['hits'] == len(first)
+    assert cache.stats()['misses'] == len(second)
+    pd.testing.assert_frame_equal(second[second['years'] != 25].reset_index(drop=True), first)
+
+    # The same inputs again: the whole grid comes from the cache
+    assert scenario_grid(500_000, down_payments, rates, terms, cache=cache) is first
+    assert cache.stats()['hits'] == len(first)
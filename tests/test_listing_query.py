@@ -0,0 +1,94 @@
+# Listing queries: the planner's results against plain pandas masks
+import numpy as np
+import pytest
+import listing_query
+from listing_query import ListingQuery, QueryCache, find_listings
+from listings import GENDERS, LISTING_TYPES, ListingStore, audience_mask, district_centers, generate_listings
+
+AUDIENCES = ['Students', 'Professionals', 'Families']
+
+# A store with a base frame and a delta, served by find_listings()
+@pytest.fixture
+def store(monkeypatch):
+    store = ListingStore(generate_listings(5_000, seed=1))
+    for listing in generate_listings(300, seed=2).to_dict('records'):
+        store.add_listing(listing)
+    monkeypatch.setattr(listing_query, "get_store", lambda: store)
+    listing_query.query_cache.clear()
+    return store
+
+# A random query and the naive mask it should select
+def random_query(rng, frame):
+    query_type = rng.choice([None] + LISTING_TYPES)
+    region = rng.choice([None, None] + list(district_centers))
+    query = ListingQuery(type=query_type, region=region)
+    mask = np.ones(len(frame), dtype=bool)
+    if query_type is not None:
+        mask &= (frame['type'] == query_type).to_numpy()
+    if region is not None:
+        mask &= (frame['region'] == region).to_numpy()
+
+    for column, method, values in (('price', query.price, (500, 3000)), ('size', query.size, (15, 250)),
+                                   ('transportation', query.transport, (1, 9))):
+        lo, hi = sorted(rng.integers(*values, size=2))
+        lo = None if rng.random() < 0.3 else int(lo)
+        hi = None if rng.random() < 0.3 else int(hi)
+        method(lo, hi)
+        if lo is not None:
+            mask &= (frame[column] >= lo).to_numpy()
+        if hi is not None:
+            mask &= (frame[column] <= hi).to_numpy()
+
+    if rng.random() < 0.5:
+        audience = rng.choice(AUDIENCES)
+        query.for_audience(audience)
+        mask &= (frame['preferences'].to_numpy() & audience_mask(audience, 'No preference')) != 0
+    schools, parks = rng.random(2) < 0.4
+    query.with_amenities(schools=schools, parks=parks)
+    if schools:
+        mask &= frame['proximity_schools'].to_numpy()
+    if parks:
+        mask &= frame['proximity_parks'].to_numpy()
+    if rng.random() < 0.3:
+        shared_living = bool(rng.random() < 0.5)
+        query.shared_living(shared_living)
+        mask &= (frame['shared_living'] == shared_living).to_numpy()
+    if query_type == 'Shared Housing' and rng.random() < 0.7:
+        gender, same_gender, max_people = rng.choice(GENDERS), bool(rng.random() < 0.5), int(rng.integers(2, 8))
+        query.shared_housing(gender, students_only=True, same_gender=same_gender, max_people=max_people)
+        gender_ok = frame['gender'] == gender
+        if not same_gender:
+            gender_ok |= ~frame['same_sex_pref']
+        mask &= (gender_ok & (frame['current_people'] < frame['max_people'])
+                 & (frame['max_people'] <= max_people) & frame['is_student']).fillna(False).to_numpy(dtype=bool)
+    return query, mask
+
+def test_find_listings_matches_naive_masks(store):
+    rng = np.random.default_rng(0)
+    frame = store.frame()
+    for _ in range(300):
+        query, mask = random_query(rng, frame)
+        result = find_listings(query)
+        assert result.to_frame()['id'].tolist() == frame.loc[mask, 'id'].tolist(), query.key()
+
+def test_cache_only_invalidates_touched_partitions(store):
+    cache = QueryCache()
+    queries = {
+        'rent': ListingQuery(type='Rent'),
+        'laim': ListingQuery(region='Laim'),
+        'sale_in_pasing': ListingQuery(type='Sale', region='Pasing-Obermenzing'),
+        'shared': ListingQuery(type='Shared Housing').price(hi=1000),
+    }
+    before = {name: len(cache.run(query, store)) for name, query in queries.items()}
+    assert cache.stats()['misses'] == len(queries)
+
+    listing = dict(store.frame().iloc[0].to_dict(), type='Rent', region='Laim')
+    store.add_listing(listing)
+    after = {name: len(cache.run(query, store)) for name, query in queries.items()}
+
+    # Untouched partitions are served from the cache...
+    assert cache.stats()['hits'] == 2
+    assert after['sale_in_pasing'] == before['sale_in_pasing'] and after['shared'] == before['shared']
+    # ...queries on the touched ones are recomputed and see the new listing
+    assert cache.stats()['misses'] == len(queries) + 2
+    assert after['rent'] == before['rent'] + 1 and after['laim'] == before['laim'] + 1
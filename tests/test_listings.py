@@ -0,0 +1,20 @@
+# Listing store: typed storage of user-offered listings
+import pytest
+from listings import ListingStore, generate_mock_data
+
+@pytest.fixture
+def store():
+    return ListingStore(generate_mock_data(2))
+
+@pytest.mark.parametrize("field, value", [("max_people", 200), ("price", 3_000_000_000), ("size", 0)])
+def test_add_listing_rejects_values_outside_the_limits(store, field, value):
+    listing = dict(store.frame().iloc[0].to_dict(), **{field: value})
+    count = len(store)
+    with pytest.raises(ValueError, match=field):
+        store.add_listing(listing)
+    assert len(store) == count
+
+def test_add_listing_keeps_large_prices_exact(store):
+    listing = dict(store.frame().iloc[0].to_dict(), price=100_000_000)
+    store.add_listing(listing)
+    assert store.frame()['price'].iloc[-1] == 100_000_000
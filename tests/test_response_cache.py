@@ -0,0 +1,102 @@
+# Response cache: expiry, LRU eviction and similar-question hits, with the
+# in-memory and the SQLite backend
+import pytest
+import response_cache
+from embeddings import HashingEmbedder
+from response_cache import MemoryBackend, ResponseCache, SQLiteBackend, normalize_prompt
+
+QUESTION = "How much deposit can my landlord ask for?"
+REWORDED = "How much deposit can the landlord ask for?"
+
+# Stands in for the time module, so expiry and LRU order do not depend on the wall clock
+class Clock():
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def tick(self, seconds=1.0):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    return clock
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_backend(request, tmp_path):
+    if request.param == "memory":
+        return lambda maxsize=100: MemoryBackend(maxsize)
+    return lambda maxsize=100: SQLiteBackend(str(tmp_path / f"responses-{maxsize}.sqlite"), maxsize)
+
+def ask(cache, prompt):
+    return cache.lookup(prompt, "English", None, None)
+
+def remember(cache, prompt, answer):
+    cache.store(prompt, "English", None, None, answer, latency=1.5)
+
+def test_exact_hit_until_ttl(make_backend, clock):
+    cache = ResponseCache(make_backend(), ttl=60)
+    remember(cache, QUESTION, "Three months of cold rent.")
+    clock.tick(30)
+    assert ask(cache, QUESTION.upper() + "!!") == "Three months of cold rent."
+    clock.tick(31)
+    assert ask(cache, QUESTION) is None
+    # The expired entry is dropped
+    assert len(cache.backend) == 0
+    assert cache.stats()["exact_hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_least_recently_used_entry_is_evicted(make_backend, clock):
+    cache = ResponseCache(make_backend(maxsize=2))
+    remember(cache, "first question", "a")
+    clock.tick()
+    remember(cache, "second question", "b")
+    clock.tick()
+    assert ask(cache, "first question") == "a"
+    clock.tick()
+    remember(cache, "third question", "c")
+    assert len(cache.backend) == 2
+    assert ask(cache, "second question") is None
+    assert ask(cache, "first question") == "a"
+    assert ask(cache, "third question") == "c"
+
+def test_semantic_hit_at_the_threshold(make_backend, clock):
+    embedder = HashingEmbedder()
+    similarity = float(embedder.embed(normalize_prompt(QUESTION)) @ embedder.embed(normalize_prompt(REWORDED)))
+    assert 0 < similarity < 1
+
+    below = ResponseCache(make_backend(), embedder=embedder, threshold=similarity - 1e-4)
+    remember(below, QUESTION, "Three months of cold rent.")
+    assert ask(below, REWORDED) == "Three months of cold rent."
+    assert below.stats()["semantic_hits"] == 1
+
+    above = ResponseCache(make_backend(maxsize=99), embedder=embedder, threshold=similarity + 1e-4)
+    remember(above, QUESTION, "Three months of cold rent.")
+    assert ask(above, REWORDED) is None
+    assert above.stats()["misses"] == 1
+
+def test_answers_are_scoped(make_backend, clock):
+    cache = ResponseCache(make_backend(), embedder=HashingEmbedder())
+    remember(cache, QUESTION, "Three months of cold rent.")
+    assert cache.lookup(QUESTION, "German", None, None) is None
+    assert cache.lookup(QUESTION, "English", {"job": "Student", "age": 23, "monthly_income": 900}, None) is None
+    assert cache.lookup(QUESTION, "English", None, ["Laim: 1200 €"]) is None
+
+# The same sequence of operations gives the same answers and stats on both backends
+def test_backends_behave_the_same(tmp_path, clock):
+    outcomes = []
+    for backend in (MemoryBackend(maxsize=3), SQLiteBackend(str(tmp_path / "responses.sqlite"), maxsize=3)):
+        cache = ResponseCache(backend, embedder=HashingEmbedder(), ttl=100)
+        answers = []
+        for step, prompt in enumerate(["rent deposit", "buying a flat", "rent deposit", "moving to Munich",
+                                       "shared flat for students", "buying a flat", "rent deposit"]):
+            clock.tick(20)
+            answer = ask(cache, prompt)
+            answers.append(answer)
+            if answer is None:
+                remember(cache, prompt, f"answer {step}")
+        outcomes.append((answers, cache.stats(), len(backend)))
+    assert outcomes[0] == outcomes[1]
+    assert outcomes[0][1]["exact_hits"] and outcomes[0][2] == 3
@@ -0,0 +1,29 @@
+import importlib
+from metrics import record_page
+
+# Page name -> (module in this package, function rendering the page).
+# Only the module of the page being shown is imported, together with its
+# dependencies; modules stay loaded, so their constants are built once per
+# process instead of on every rerun.
+PAGES = {
+    "Home": ("home", "home_page"),
+    "Step-by-Step Guide": ("guide", "step_by_step_guide"),
+    "AI Chat Assistant": ("assistant", "ai_chat_assistant_page"),
+    "Financial Tools": ("financial_tools", "financial_tools"),
+    "Smart Recommendations": ("recommendations", "smart_recommendations"),
+    "Location Visualizer": ("location", "location_visualizer"),
+    "Quiz": ("quiz", "quiz"),
+    "Profile": ("profile", "profile_page"),
+    "Offer a House": ("offer", "offer_a_house_page"),
+    "FAQ": ("faq", "faq_page"),
+    "Chat": ("chat", "chat_page"),
+}
+
+# Function rendering a page, importing its module on first use
+def page_function(page_name):
+    module_name, function_name = PAGES[page_name]
+    return getattr(importlib.import_module(f"{__name__}.{module_name}"), function_name)
+
+# Render a page, recording its run time and payload in the metrics registry
+def render(page_name):
+    record_page(page_name, page_function(page_name))
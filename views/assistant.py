@@ -0,0 +1,42 @@
+import streamlit as st
+import bot
+from chat_context import build_housing_context
+from storage import get_storage
+from views.navigation import set_page
+
+# AI Chat Assistant Page
+def ai_chat_assistant_page():
+    st.title("AI Chat Assistant")
+    # Per-session conversation; the model client behind it is shared by all sessions
+    if "chat_bot" not in st.session_state:
+        st.session_state["chat_bot"] = bot.Bot()
+    st.session_state["step"] = 1
+    st.session_state["user_type"] = None
+
+    for message in st.session_state["ai_messages"]:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
+    if prompt := st.chat_input("Servus!"):
+        with st.chat_message("user"):
+            st.markdown(prompt)
+        st.session_state["ai_messages"].append({"role": "user", "content": prompt})
+
+
+        # Assessed listings most relevant to the question, within the token budget
+        homess = build_housing_context(get_storage().assessments.listing_ids(st.session_state["profile_id"]), prompt)
+
+        # Stream the answer so the first tokens show up while the rest is generated
+        with st.chat_message("assistant"):
+            response = st.write_stream(st.session_state["chat_bot"].stream(prompt=prompt,language = st.session_state["chat_language"], context = homess, user = st.session_state["user_profile"]))
+        st.session_state["ai_messages"].append({"role": "assistant", "content": response})
+
+    if st.button("Reset Chat"):
+        st.session_state["ai_messages"].clear()
+        st.session_state["chat_bot"].memory.clear()
+        set_page("AI Chat Assistant")
+    
+    st.session_state["chat_language"] = st.selectbox("Language", ["English", "German", "Spanish", "Chinese (mandarin)"])
+
+    if st.button("Back to Home"):
+        set_page("Home")
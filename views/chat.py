@@ -0,0 +1,48 @@
+import html
+from datetime import datetime
+import streamlit as st
+from storage import get_storage
+from views.navigation import set_page
+
+# Chat Page
+def chat_page():
+    st.title("Chat")
+    st.markdown("Send messages to other users.")
+
+    # Select recipient (hardcoded user list for demo purposes)
+    recipients = ["Marc the Guru", "John Doe", "Jane Smith", "Alex Brown", "T. Hofmann"]
+    recipient = st.selectbox("Select recipient", recipients)
+
+    # Message input
+    message = st.text_area("Type your message")
+
+    # Send button
+    if st.button("Send"):
+        if recipient and message:
+            get_storage().messages.add(st.session_state["profile_id"], recipient, message)
+            st.success("Message sent!")
+        else:
+            st.error("Please select a recipient and type a message.")
+
+    # Display chat history for the selected recipient
+    st.markdown(f"### Chat History with {recipient}")
+    messages = get_storage().messages.conversation(st.session_state["profile_id"], recipient)
+
+    # Better UI for chat history
+    if messages:
+        for msg in messages:
+            st.markdown(
+                f"""
+                <div style="margin-bottom: 10px; padding: 10px; border: 1px solid #ddd; border-radius: 5px; background-color: #b7d7de;">
+                    <strong>{html.escape(recipient)}</strong> <span style="font-size: 0.8em; color: #555;">({datetime.fromtimestamp(msg['created_at']):%d.%m.%Y %H:%M})</span>
+                    <div style="margin-top: 5px;">{html.escape(msg['message'])}</div>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+    else:
+        st.write("No messages with this recipient yet.")
+
+    # Back to Profile button
+    if st.button("Back to Profile"):
+        set_page("Profile")
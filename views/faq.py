@@ -0,0 +1,25 @@
+import streamlit as st
+from knowledge import FAQS
+
+# FAQ Page
+def faq_page():
+    st.title("Frequently Asked Questions (FAQ)")
+    st.markdown("Find answers to common questions below.")
+    st.session_state["step"] = 1
+    st.session_state["user_type"] = None
+
+    # Search box
+    query = st.text_input("Search FAQs", "").lower()
+
+    # Display FAQs dynamically based on search query
+    for category, items in FAQS.items():
+        filtered_items = [item for item in items if query in item["question"].lower()]
+        if filtered_items:
+            st.subheader(category)
+            for item in filtered_items:
+                with st.expander(item["question"]):
+                    st.write(item["answer"])
+
+    # If no results match the query
+    if query and all(not [item for item in items if query in item["question"].lower()] for items in FAQS.values()):
+        st.warning("No FAQs found matching your search. Try a different query.")
@@ -0,0 +1,68 @@
+import numpy as np
+import streamlit as st
+from charts import payment_breakdown_chart, scenario_heatmap
+from finance import annuity_payment, scenario_grid
+
+# Financial Tools
+def financial_tools():
+    st.title("Financial Tools")
+    st.header("Financial Planning Tools: Mortgage Calculator")
+    st.session_state["step"] = 1
+    st.session_state["user_type"] = None
+
+    # Inputs
+    principal = st.number_input("Loan Amount (€)", value=100000)
+    rate = st.number_input("Interest Rate (%)", value=3.0)
+    years = st.number_input("Loan Term (Years)", value=20)
+
+    if st.button("Calculate Monthly Payment"):
+        st.write(f"Monthly Payment: €{float(annuity_payment(principal, rate, years)):.2f}")
+
+        # Payment Breakdown: cumulative interest and principal paid, drawn in the browser
+        st.vega_lite_chart(payment_breakdown_chart(float(principal), float(rate), float(years)), use_container_width=True)
+
+    scenario_grid_tool()
+
+# Metrics the scenario grid can show, with their display format
+SCENARIO_METRICS = {
+    "Monthly payment (€)": ("payment", ",.0f"),
+    "Total interest (€)": ("total_interest", ",.0f"),
+    "Years until paid off": ("payoff_years", ".1f"),
+    "Balance at end of Zinsbindung (€)": ("balance_at_refinance", ",.0f"),
+}
+
+# Scenario grid: compare interest rates x loan terms x down payments at once
+def scenario_grid_tool():
+    st.header("Scenario Comparison")
+    st.write("Compare interest rates, loan terms and down payments side by side. Only changed scenarios are recalculated.")
+
+    price = st.number_input("Purchase Price (€)", min_value=10000, value=500000, step=10000)
+    col1, col2 = st.columns(2)
+    with col1:
+        rate_range = st.slider("Interest Rate Range (%)", 0.5, 10.0, (2.0, 5.0), step=0.25)
+        rate_step = st.select_slider("Rate Step (%)", [0.05, 0.1, 0.25, 0.5], value=0.25)
+        down_payments = st.multiselect("Down Payments (€)", list(range(0, 300001, 25000)), default=[50000, 100000, 150000])
+    with col2:
+        terms = st.multiselect("Loan Terms (Years)", list(range(5, 41, 5)), default=[15, 20, 25, 30])
+        special_repayment = st.slider("Sondertilgung (% of the loan per year)", 0.0, 10.0, 0.0, step=0.5)
+        fixed_years = st.selectbox("Zinsbindung (Years)", [5, 10, 15, 20, "Whole term"], index=1)
+        refinance_rate = st.number_input("Expected Rate after Zinsbindung (%)", min_value=0.0, value=4.0, step=0.25)
+
+    if not down_payments or not terms:
+        st.info("Choose at least one down payment and one loan term.")
+        return
+    rates = np.round(np.arange(rate_range[0], rate_range[1] + rate_step / 2, rate_step), 2)
+    # Hashable grid inputs; the grid and its chart are cached on them
+    inputs = (
+        float(price), tuple(sorted(down_payments)), tuple(rates.tolist()), tuple(sorted(terms)), float(special_repayment),
+        None if fixed_years == "Whole term" else fixed_years,
+        None if fixed_years == "Whole term" else float(refinance_rate),
+    )
+    grid = scenario_grid(*inputs)
+    st.caption(f"{len(grid):,} scenarios")
+
+    metric = st.selectbox("Show", list(SCENARIO_METRICS))
+    column, number_format = SCENARIO_METRICS[metric]
+    st.vega_lite_chart(scenario_heatmap(*inputs, column, metric, number_format))
+    with st.expander("All scenarios as a table"):
+        st.dataframe(grid, hide_index=True)
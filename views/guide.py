@@ -0,0 +1,248 @@
+import html
+import streamlit as st
+from listings import GENDERS, get_store, preference_text
+from listing_query import ListingQuery, find_listings
+from storage import get_storage
+from views.navigation import set_page, set_user_type
+
+# Step-by-Step Guide
+def step_by_step_guide():
+    st.title("Step-by-Step Guide")
+    # Step 1: Ask user type
+
+    if st.session_state["step"] == 1:
+        st.header("What best describes you?")
+        col1, col2, col3 , col4= st.columns(4)
+        with col1:
+            if st.button("Professional"):
+                set_user_type("Professional")
+                st.rerun()
+        with col2:
+            if st.button("Student"):
+                set_user_type("Student")
+                st.rerun()
+        with col3:
+            if st.button("Family"):
+                set_user_type("Family")
+                st.rerun()
+        with col4:
+           if st.button("Back to Home"):
+                set_page("Home")
+
+
+    # Step 2: Tailored flow based on user type
+    elif st.session_state["step"] == 2:
+        user_type = st.session_state["user_type"]
+        st.subheader(f"You selected: {user_type}")
+        if user_type == "Professional":
+            professional_flow()
+        elif user_type == "Student":
+            student_flow()
+        elif user_type == "Family":
+            family_flow()
+
+# Default filter inputs of the guide flows, (min, max) per range. Radios
+# default to their first option: "Yes", and the first of GENDERS.
+PROFESSIONAL_PRICE_DEFAULTS = {"Rent": (0, 4000), "Sale": (0, 1_000_000)}
+PROFESSIONAL_SIZE_DEFAULT = (0, 300)
+STUDENT_PRICE_DEFAULT = (0, 2000)
+STUDENT_SIZE_DEFAULT = (0, 100)
+SHARED_HOUSING_PRICE_DEFAULT = 1000
+SHARED_HOUSING_PEOPLE_DEFAULT = 3
+FAMILY_PRICE_DEFAULT = (0, 5000)
+FAMILY_SIZE_DEFAULT = (50, 300)
+
+# The queries behind "Find Matches" of the flows; benchmarks/suite.py times
+# them with the defaults above
+def professional_query(choice, price_min, price_max, size_min, size_max):
+    return ListingQuery(type=choice).price(price_min, price_max).size(size_min, size_max).for_audience('Professionals')
+
+def student_query(price_min, price_max, size_min, size_max):
+    return ListingQuery(type="Rent").price(price_min, price_max).size(size_min, size_max).for_audience('Students')
+
+def shared_housing_query(price_max, gender, same_gender, max_people):
+    return (
+        ListingQuery(type="Shared Housing")
+        .price(hi=price_max)
+        .shared_housing(gender, students_only=True, same_gender=same_gender, max_people=max_people)
+        .for_audience('Students')
+    )
+
+def family_query(choice, price_min, price_max, size_min, size_max, schools, parks):
+    return (
+        ListingQuery(type=choice)
+        .price(price_min, price_max)
+        .size(size_min, size_max)
+        .for_audience('Families')
+        .with_amenities(schools=schools, parks=parks)
+    )
+
+# Page sizes offered for the guide-flow match lists
+MATCH_PAGE_SIZES = [10, 25, 50, 100]
+
+MATCH_CARD_STYLE = "border: 1px solid #ddd; border-radius: 5px; padding: 10px; margin-bottom: 10px; background-color: #f9f9f9;"
+
+# Build the HTML of all listing cards on a page in one vectorized pass.
+# The address is user-provided, so it is escaped.
+def listing_cards_html(page, show_amenities=False):
+    cards = (
+        f'<div style="{MATCH_CARD_STYLE}">'
+        + "<strong>Type:</strong> " + page["type"].astype(str)
+        + "<br><strong>Address:</strong> " + page["address"].astype(str).map(html.escape)
+        + "<br><strong>Size:</strong> " + page["size"].astype(str) + " sq. meters"
+        + "<br><strong>Price:</strong> €" + page["price"].astype(str)
+        + "<br><strong>Preferences:</strong> " + preference_text(page["preferences"])
+    )
+    if show_amenities:
+        cards = (
+            cards
+            + "<br><strong>Proximity to Schools:</strong> " + page["proximity_schools"].map({True: "Yes", False: "No"})
+            + "<br><strong>Proximity to Parks:</strong> " + page["proximity_parks"].map({True: "Yes", False: "No"})
+        )
+    return "".join((cards + "</div>").tolist())
+
+# Remember the query of a "Find Matches" click so the results survive reruns
+def start_matches(flow, query, label):
+    st.session_state["matches"] = {"flow": flow, "query": query, "label": label, "pages": 1}
+
+# Show the stored matches of a flow, one page at a time with "Load more".
+# Returns the frame of the listings shown, or None if there is nothing to show.
+def render_matches(flow, show_amenities=False):
+    matches = st.session_state.get("matches")
+    if not matches or matches["flow"] != flow:
+        return None
+    result = find_listings(matches["query"])
+    if result.empty:
+        st.warning(f"No {matches['label']} options found matching your criteria.")
+        return None
+
+    page_size = st.selectbox("Results per page", MATCH_PAGE_SIZES, key="match_page_size")
+    shown = min(matches["pages"] * page_size, len(result))
+    page = result.to_frame(0, shown)
+    st.write(f"### Matching {matches['label']} options:")
+    st.caption(f"Showing {shown} of {len(result)}")
+    st.markdown(listing_cards_html(page, show_amenities), unsafe_allow_html=True)
+    if shown < len(result) and st.button("Load more"):
+        matches["pages"] += 1
+        st.rerun()
+    return page
+
+# Professional Flow
+def professional_flow():
+    st.title("Guide for Professionals")
+    st.write("### Step 1: Are you looking to Rent or Buy?")
+    choice = st.radio("Select your preference:", ["Rent", "Sale"])
+
+    if choice:
+        st.write(f"### Step 2: Filter {choice.lower()} options")
+
+        # Adjust price range dynamically
+        price_label = "Price per Month (€)" if choice == "Rent" else "Price (€)"
+        price_min_default, price_max_default = PROFESSIONAL_PRICE_DEFAULTS[choice]
+
+        # Filter inputs
+        price_min = st.number_input(f"Minimum {price_label}", min_value=0, value=price_min_default)
+        price_max = st.number_input(f"Maximum {price_label}", min_value=0, value=price_max_default)
+        size_min = st.number_input("Minimum Size (sq. meters)", min_value=0, value=PROFESSIONAL_SIZE_DEFAULT[0])
+        size_max = st.number_input("Maximum Size (sq. meters)", min_value=0, value=PROFESSIONAL_SIZE_DEFAULT[1])
+        if st.button("Back"):
+            st.session_state["step"] = 1
+            st.session_state["user_type"] = None
+            st.session_state.pop("matches", None)
+            st.rerun()
+
+
+        # Find matching properties
+        if st.button("Find Matches"):
+            if len(get_store()) > 0:
+                # Filter properties
+                query = professional_query(choice, price_min, price_max, size_min, size_max)
+                start_matches("Professional", query, choice.lower())
+            else:
+                st.error("No properties available in the database.")
+
+        # Display matches
+        page = render_matches("Professional")
+        if page is not None and not page.empty:
+            address = st.selectbox("Apply to", page["address"].tolist())
+            if st.button("Apply"):
+                get_storage().messages.add(st.session_state["profile_id"], "John Doe", f"I would like to apply for {address}.")
+                st.success("Application sent!")
+
+# Student Flow
+def student_flow():
+    st.title("Guide for Students")
+    st.write("### Step 1: Are you looking for Rent or Shared Housing?")
+    choice = st.radio("Select your preference:", ["Rent", "Shared Housing"])
+
+    if choice:
+        st.write(f"### Step 2: Filter {choice.lower()} options")
+
+        if choice == "Rent":
+            # Rent-specific filtering
+            price_min = st.number_input("Minimum Price (€)", min_value=0, value=STUDENT_PRICE_DEFAULT[0])
+            price_max = st.number_input("Maximum Price (€)", min_value=0, value=STUDENT_PRICE_DEFAULT[1])
+            size_min = st.number_input("Minimum Size (sq. meters)", min_value=0, value=STUDENT_SIZE_DEFAULT[0])
+            size_max = st.number_input("Maximum Size (sq. meters)", min_value=0, value=STUDENT_SIZE_DEFAULT[1])
+
+        elif choice == "Shared Housing":
+            # Shared Housing-specific filtering
+            # Gender and Same-Gender Preference
+            gender = st.radio("Your Gender", GENDERS)
+            my_same_gender_pref = st.radio("Do you prefer same-gender housing?", ["Yes", "No"]) == "Yes"
+            max_people = st.number_input("Maximum number of people wished", min_value=1, value=SHARED_HOUSING_PEOPLE_DEFAULT)
+            price_max = st.number_input("Maximum Price (€)", min_value=0, value=SHARED_HOUSING_PRICE_DEFAULT)
+        if st.button("Back"):
+            st.session_state["step"] = 1
+            st.session_state["user_type"] = None
+            st.session_state.pop("matches", None)
+            st.rerun()
+
+        # Find matches
+        if st.button("Find Matches"):
+            if len(get_store()) > 0:
+                # Filter logic
+                if choice == "Rent":
+                    query = student_query(price_min, price_max, size_min, size_max)
+                elif choice == "Shared Housing":
+                    query = shared_housing_query(price_max, gender, my_same_gender_pref, max_people)
+                start_matches("Student", query, choice.lower())
+            else:
+                st.error("No properties available in the database.")
+
+        # Display matches
+        render_matches("Student")
+
+# Family Flow
+def family_flow():
+    st.title("Guide for Families")
+    st.write("### Step 1: Are you looking for Rent or Buy?")
+    choice = st.radio("Select your preference:", ["Rent", "Sale"])
+
+    if choice:
+        st.write(f"### Step 2: Filter {choice.lower()} options")
+
+        # Collect family-specific preferences
+        proximity_schools = st.radio("Do you need proximity to schools?", ["Yes", "No"]) == "Yes"
+        proximity_parks = st.radio("Do you need proximity to parks?", ["Yes", "No"]) == "Yes"
+        price_min = st.number_input("Minimum Price (€)", min_value=0, value=FAMILY_PRICE_DEFAULT[0])
+        price_max = st.number_input("Maximum Price (€)", min_value=0, value=FAMILY_PRICE_DEFAULT[1])
+        size_min = st.number_input("Minimum Size (sq. meters)", min_value=0, value=FAMILY_SIZE_DEFAULT[0])
+        size_max = st.number_input("Maximum Size (sq. meters)", min_value=0, value=FAMILY_SIZE_DEFAULT[1])
+        if st.button("Back"):
+            st.session_state["step"] = 1
+            st.session_state["user_type"] = None
+            st.session_state.pop("matches", None)
+            st.rerun()
+
+        # Find matches
+        if st.button("Find Matches"):
+            if len(get_store()) > 0:
+                # Filter properties
+                query = family_query(choice, price_min, price_max, size_min, size_max, proximity_schools, proximity_parks)
+                start_matches("Family", query, choice.lower())
+            else:
+                st.error("No properties available in the database.")
+
+        # Display matches
+        render_matches("Family", show_amenities=True)
@@ -0,0 +1,25 @@
+import streamlit as st
+from views.navigation import set_page
+
+# Home Page
+def home_page():
+    st.title("Welcome")
+    st.markdown(
+        """
+        **Our Mission**: Helping you navigate the German housing market with ease.  
+        **What We Offer**:
+        - Step-by-step guides tailored to your needs.
+        - Smart financial tools and recommendations.
+        - An AI assistant to answer all your housing questions.
+        """)
+    st.session_state["step"] = 1
+    st.session_state["user_type"] = None
+    # Buttons for navigation
+    if st.button("Get Step-by-Step Guide"):
+        set_page("Step-by-Step Guide")
+
+    if st.button("Ask AI Chat Assistant"):
+        set_page("AI Chat Assistant")
+
+    if st.button("FAQ"):
+        set_page("FAQ")
@@ -0,0 +1,233 @@
+import numpy as np
+import streamlit as st
+from maps import (
+    DISTRICT_ZOOM, bounds_within, district_at, district_base_map, district_count_layer, district_detail_base_map,
+    district_house_layer, house_at, output_bounds, padded_bounds, st_folium_layered,
+)
+from listings import district_centers, get_store
+from listing_query import ListingQuery, find_listings
+from storage import get_storage
+
+# Placeholder pictures for the house details, picked by listing id
+HOUSE_IMAGES = (
+    "https://pictures.immobilienscout24.de/dims3/S3/legacy_thumbnail/800x600/format/webp/quality/73/http://s3-eu-west-1.amazonaws.com/pda-pro-pictures-projectpictures-8hecgpgpb9fo/59977873/b3e639e2-8b5d-419b-b3f4-a13ef1b06b44.jpg",
+    "https://pictures.immobilienscout24.de/listings/b1b0fe30-24fa-45eb-b339-6cc380bc12a4-1862446778.jpg/ORIG/legacy_thumbnail/420x315/format/webp/quality/73",
+    "https://pictures.immobilienscout24.de/listings/31470eae-6ddc-4c30-a35a-128c2799c3a9-1862590404.jpg/ORIG/legacy_thumbnail/420x315/format/webp/quality/73",
+    "https://pictures.immobilienscout24.de/listings/a7eafd80-0384-4b80-99b0-805efd4f19e7-1790699901.jpg/ORIG/legacy_thumbnail/420x315/format/webp/quality/73",
+    "https://pictures.immobilienscout24.de/listings/7f3366f9-e056-44c6-9a9a-16ea57045902-1409219300.jpg/ORIG/legacy_thumbnail/420x315/format/webp/quality/73",
+    "https://pictures.immobilienscout24.de/listings/5cbbb3b2-5b7b-4a79-84ad-4113467fe69f-1859079993.jpg/ORIG/legacy_thumbnail/420x315/format/webp/quality/73",
+    "https://pictures.immobilienscout24.de/listings/cd5b168f-d60a-4e26-9bfa-a61910b223fe-1861893232.jpg/ORIG/legacy_thumbnail/420x315/format/webp/quality/73",
+    "https://pictures.immobilienscout24.de/listings/a75f94ae-e032-48db-a1f6-65b16178c51b-1859861946.jpg/ORIG/legacy_thumbnail/420x315/format/webp/quality/73",
+    "https://pictures.immobilienscout24.de/listings/662e6141-31f9-4d61-8f21-66cdd8b0dacd-1845492399.jpg/ORIG/legacy_thumbnail/420x315/format/webp/quality/73",
+    "https://pictures.immobilienscout24.de/listings/772d8c24-910a-4ca2-99ab-98b49d990862-1838047478.jpg/ORIG/legacy_thumbnail/420x315/format/webp/quality/73",
+    "https://pictures.immobilienscout24.de/listings/b924fca7-1d32-4035-aea5-8752ab50eead-1810315289.jpg/ORIG/legacy_thumbnail/420x315/format/webp/quality/73",
+    "https://pictures.immobilienscout24.de/listings/f8fa991e-1f0b-4d9b-ab1c-26f4462fafec-1860463939.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/851fb9e7-da7a-4001-93d9-f1c4d3edede9-1857806205.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/9fcc1164-fa48-4b85-accc-6452a3ab5b54-1858257537.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/b99693e0-e70b-48f5-824a-122935e66ba8-1854421902.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/9f8a3908-823d-4ceb-9c52-63ee816652c1-1860936626.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/441c2204-0ead-40c9-9f6f-18bf296881b1-1491910987.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/336f39ea-5064-4b2f-8e56-f78375561445-1851651912.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/42d03a56-1bb0-4ecb-8f6e-b8a5d60ab03d-1846082319.jpeg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/3072b6f1-fe9e-40af-be27-8f5c49b708e1-1859322008.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/32ef8af0-4602-46fe-b800-8c244ef1fd44-1858950053.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/5ddbaf57-0077-42d9-95c5-d269d9eb1f24-1857854473.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/b554d22f-a028-42fd-965e-e876f3e41ad4-1856810703.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/413b43ba-c4bb-4c56-80f5-17364fbd719f-1853173455.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/e995aa19-8bc2-4221-8ca0-e355575d6065-1856184726.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/bd627363-aaa8-42ea-9717-f9264dbf58e9-1861202025.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/8840f5c5-acca-4fec-9703-7674dcd4a040-1860846507.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/99e2cae4-a748-4384-9940-e9e51ec30a2a-1860344126.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/5a97271b-6055-40cd-aa0f-997280a7b71f-1860203449.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/98b1e9d1-4d70-4d2c-aaf7-69628f22839a-1859327566.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/0a21fe69-72c6-4fec-aac6-a8bc4a59c6e8-1854786018.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/4f071de9-dfd1-4239-ac45-afaf39fb7811-1851392403.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/3e105cc3-c939-4477-8c13-f1b82a73d992-1848432677.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/3e105cc3-c939-4477-8c13-f1b82a73d992-1848432677.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/df620cd6-dab3-47e7-9e68-d0fa806db4b1-1853516841.png/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    "https://pictures.immobilienscout24.de/listings/a27cff34-0e19-48cc-b24a-9ee7db8974bf-1829425500.jpg/ORIG/legacy_thumbnail/420x315/format/jpg/quality/80",
+    
+)
+
+# Count houses per district
+def count_houses_per_district(houses):
+    district_counts = houses['region'].value_counts().reset_index()
+    district_counts.columns = ['District', 'Number of Houses']
+    return district_counts
+
+# Function to assess if the user can get the selected house
+def assess_user_for_house(user_profile, house):
+    # Simple assessment logic:
+    # User must have monthly income at least twice the rent price
+    # User must be above 18 years old
+    required_income = house['price'] * 2
+    user_income = user_profile.get('monthly_income', 0)
+    user_age = user_profile.get('age', 0)
+
+    if user_income >= required_income and user_age >= 18:
+        # Only the id is kept; the chat builds a compact context from the store
+        get_storage().assessments.add(st.session_state["profile_id"], house['id'])
+        return True
+    else:
+        return False
+
+# Preferences the location visualizer starts with
+DEFAULT_PREFERENCES = {
+    'price': 1500,
+    'transportation': 7,
+    'shared_living': True
+}
+
+# Listing query for the location visualizer preferences
+def preference_query(preferences, region=None):
+    return (
+        ListingQuery(region=region)
+        .price(hi=preferences['price'])
+        .transport(lo=preferences['transportation'])
+        .shared_living(preferences['shared_living'])
+    )
+
+# Location Visualizer
+def location_visualizer():
+    st.header("Interactive Location Visualizer")
+
+    # Initialize session state for user preferences and housing data
+    if 'user_preferences' not in st.session_state:
+        st.session_state['user_preferences'] = dict(DEFAULT_PREFERENCES)
+    if 'selected_district' not in st.session_state:
+        st.session_state['selected_district'] = None
+    if 'selected_house' not in st.session_state:
+        st.session_state['selected_house'] = None
+
+    # Sidebar: User Preferences
+    st.sidebar.header("Set Your Preferences")
+    price = st.sidebar.slider("Preferred Price (€)", 500, 3000, st.session_state['user_preferences']['price'])
+    transportation = st.sidebar.slider("Proximity to Transportation (1=Far, 10=Close)", 1, 10, st.session_state['user_preferences']['transportation'])
+    shared_living = st.sidebar.radio("Shared Living?", [False, True], index=int(st.session_state['user_preferences']['shared_living']))
+
+    # Update session state preferences only if they change
+    if (price, transportation, shared_living) != (
+        st.session_state['user_preferences']['price'],
+        st.session_state['user_preferences']['transportation'],
+        st.session_state['user_preferences']['shared_living']
+    ):
+        st.session_state['user_preferences'] = {
+            'price': price,
+            'transportation': transportation,
+            'shared_living': shared_living
+        }
+        # Reset selected district and house when preferences change
+        st.session_state['selected_district'] = None
+        st.session_state['selected_house'] = None
+
+    # Load the shared listing snapshot
+    houses = get_store().frame()
+
+    # Filter houses based on user preferences
+    filtered_houses = find_listings(preference_query(st.session_state['user_preferences'])).to_frame()
+
+    # Map Visualization
+    st.header("Explore the Number of Houses Per District")
+
+    if st.session_state['selected_district'] is None:
+        # Show the districts with counts: cached base map plus a layer with the counts
+        counts = filtered_houses['region'].value_counts()
+        map_output = st_folium_layered(district_base_map(), district_count_layer(counts), key="district_overview", width=800, height=600)
+
+        # Handle district marker clicks
+        if map_output and map_output['last_object_clicked']:
+            # Get the location of the click
+            clicked_lat = map_output['last_object_clicked']['lat']
+            clicked_lng = map_output['last_object_clicked']['lng']
+
+            # Identify which district was clicked
+            district = district_at(clicked_lat, clicked_lng)
+            if district is not None:
+                st.session_state['selected_district'] = district
+    else:
+        # Show the houses in the selected district
+        selected_district = st.session_state['selected_district']
+
+        # Map position of the drill-down, reset whenever another district is opened
+        view = st.session_state.get('district_view')
+        if view is None or view['district'] != selected_district:
+            view = {'district': selected_district, 'center': district_centers[selected_district], 'zoom': DISTRICT_ZOOM, 'bounds': None, 'last_click': None}
+            st.session_state['district_view'] = view
+
+        # Filter houses in the selected district
+        district_houses = find_listings(preference_query(st.session_state['user_preferences'], region=selected_district)).to_frame()
+
+        # Cluster dense areas for the current zoom level, individual markers elsewhere
+        house_layer, clusters, drawn_ids = district_house_layer(district_houses, view['zoom'], view['bounds'])
+
+        # Display the cached district base map with the house layer
+        map_output = st_folium_layered(
+            district_detail_base_map(selected_district), house_layer, key=f"district_{selected_district}",
+            center=view['center'], zoom=view['zoom'], width=800, height=600,
+        )
+
+        # Re-cluster when the user zooms or pans out of the clustered area
+        bounds = output_bounds(map_output) if map_output else None
+        if bounds and map_output.get('zoom') and map_output.get('center') and (
+            map_output['zoom'] != view['zoom']
+            or view['bounds'] is None
+            or not bounds_within(bounds, padded_bounds(view['bounds']))
+        ):
+            view['zoom'] = map_output['zoom']
+            view['center'] = [map_output['center']['lat'], map_output['center']['lng']]
+            view['bounds'] = bounds
+            st.rerun()
+
+        # Zoom into a cluster when it is clicked
+        if map_output and map_output['last_object_clicked'] and map_output['last_object_clicked'] != view['last_click']:
+            view['last_click'] = map_output['last_object_clicked']
+            clicked = np.array([map_output['last_object_clicked']['lat'], map_output['last_object_clicked']['lng']])
+            if len(clusters['count']):
+                offsets = np.hypot(clusters['lat'] - clicked[0], clusters['lon'] - clicked[1])
+                if offsets.min() < 1e-6:
+                    view['center'] = clicked.tolist()
+                    view['zoom'] = view['zoom'] + 2
+                    st.rerun()
+
+        # Handle house marker clicks
+        if map_output and map_output['last_object_clicked']:
+            # Get the location of the click
+            clicked_lat = map_output['last_object_clicked']['lat']
+            clicked_lng = map_output['last_object_clicked']['lng']
+
+            # Find the house that was clicked
+            house_id = house_at(get_store(), drawn_ids, clicked_lat, clicked_lng)
+            if house_id is not None:
+                st.session_state['selected_house'] = house_id
+
+        # Display house details and assessment if a house is selected
+        if st.session_state['selected_house']:
+            selected_house = houses[houses['id'] == st.session_state['selected_house']].iloc[0]
+            st.subheader("House Details")
+            st.write(f"**House ID:** {selected_house['id']}")
+            st.write(f"**Price:** €{selected_house['price']}")
+            st.write(f"**Transport Score:** {selected_house['transportation']}")
+            st.write(f"**Shared Living:** {'Yes' if selected_house['shared_living'] else 'No'}")
+            st.write(f"**Address:** {selected_house['address'] if 'address' in selected_house else 'N/A'}")
+            st.write("**Picture:**")
+            image_index = selected_house['id'] % len(HOUSE_IMAGES)  # Cycle through images
+            st.image(HOUSE_IMAGES[image_index], caption="House Image") # Replace with actual image URL
+
+            # Assess button
+            if st.button("Assess"):
+                assessment = assess_user_for_house(st.session_state['user_profile'], selected_house)
+                if assessment:
+                    st.success('Congratulations! You meet the requirements for this house.', icon="✅")  
+                else:
+                    st.error("We're sorry, but you do not meet the requirements for this house.")
+
+            # Option to go back to the map view
+            if st.button("Back to Map"):
+                st.session_state['selected_house'] = None
+                st.rerun()
+
+        # Option to go back to district view
+        if st.button("Back to Districts"):
+            st.session_state['selected_district'] = None
+            st.session_state['selected_house'] = None
+            st.rerun()
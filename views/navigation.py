@@ -0,0 +1,15 @@
+import streamlit as st
+
+# Helper function for page navigation
+def set_page(page_name):
+    st.session_state["current_page"] = page_name
+    st.rerun()
+
+# Helper function to update the current step
+def next_step(step):
+    st.session_state["current_step"] = step
+
+# Helper function for setting up the user type
+def set_user_type(user_type):
+    st.session_state["user_type"] = user_type
+    st.session_state["step"] = 2
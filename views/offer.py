@@ -0,0 +1,79 @@
+import numpy as np
+import streamlit as st
+from listings import LISTING_LIMITS, get_store
+from views.navigation import set_page
+
+# Offer a House Page
+def offer_a_house_page():
+    st.title("Offer a House")
+    st.markdown("Provide details about your property below:")
+    st.session_state["step"] = 1
+    st.session_state["user_type"] = None
+
+    # Property details form
+    property_type = st.selectbox("Is this property for Rent, Sale, or Shared Housing?", ["Rent", "Sale", "Shared Housing"])
+    owner_name = st.text_input("Owner Name")
+    address = st.text_input("Address")
+    size = st.number_input("Size (in sq. meters)", min_value=0, max_value=LISTING_LIMITS['size'][1])
+    price = st.number_input("Price (€)", min_value=0, max_value=LISTING_LIMITS['price'][1])
+
+    # Proximity details for family-friendly properties
+    proximity_schools = st.radio("Is the property close to schools?", ["Yes", "No"]) == "Yes"
+    proximity_parks = st.radio("Is the property close to parks?", ["Yes", "No"]) == "Yes"
+
+    # Shared housing specific details
+    shared_housing_details = {}
+    if property_type == "Shared Housing":
+        gender = st.radio("Your Gender", ["Male", "Female", "Divers"])
+        is_student = st.radio("Are you a student?", ["Yes", "No"]) == "Yes"
+        current_people = st.number_input("Number of people currently living in the house", min_value=0, max_value=LISTING_LIMITS['current_people'][1] - 1, value=0)
+        max_people = st.number_input("Maximum number of people allowed", min_value=int(current_people) + 1, max_value=LISTING_LIMITS['max_people'][1])
+        same_sex_pref = st.radio("Same-sex preference?", ["Yes", "No"])
+        shared_housing_details = {
+            "gender": gender,
+            "is_student": is_student,
+            "current_people": current_people,
+            "max_people": max_people,
+            "same_sex_pref": same_sex_pref,
+        }
+        preferences = ["Students"]
+    else:
+        preferences = st.multiselect(
+            "Preferences",
+            ["Students", "Professionals", "Families", "No preference"]
+        )
+
+    # Save to database button
+    if st.button("Submit"):
+        if address and size and price:
+            # Create new property entry
+            new_property = {
+                "price": price,
+                "transportation": np.random.randint(1, 10),
+                "shared_living": property_type == 'Shared Housing',
+                "lat": np.random.uniform(48.1, 48.2),
+                "lon": np.random.uniform(11.5, 11.7),
+                "region": 'Unknown',
+                "address": address,
+                "type": property_type,
+                "size": size,
+                "preferences": preferences,
+                "proximity_schools": proximity_schools,
+                "proximity_parks": proximity_parks,
+                "owner_name": owner_name,
+                "gender": shared_housing_details.get('gender', None),
+                "is_student": shared_housing_details.get('is_student', None),
+                "current_people": shared_housing_details.get('current_people', None),
+                "max_people": shared_housing_details.get('max_people', None),
+                "same_sex_pref": shared_housing_details.get('same_sex_pref', None),
+            }
+
+            try:
+                get_store().add_listing(new_property)
+                st.success("Property added successfully!")
+            except ValueError as error:
+                st.error(f"The property could not be added: {error}")
+        else:
+            st.error("Please fill in all required fields.")
+    if st.button("Back to Home"):
+        set_page("Home")
@@ -0,0 +1,57 @@
+import streamlit as st
+from storage import get_storage
+from views.navigation import set_page
+
+# Profile Page
+def profile_page():
+    st.title("Profile")
+    st.markdown(
+        f"""
+        <div style="background-color: #b7d7de; padding: 15px; border-radius: 5px;">
+            <h2 style="margin: 0;">Edit Your Profile</h2>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+    st.session_state["step"] = 1
+    st.session_state["user_type"] = None
+
+    # User profile form
+    user_profile = st.session_state["user_profile"]
+    user_profile["email"] = st.text_input("Email", user_profile["email"])
+    user_profile["name"] = st.text_input("Name", user_profile["name"])
+    user_profile["surname"] = st.text_input("Surname", user_profile["surname"])
+    user_profile["phone"] = st.text_input("Phone Number", user_profile["phone"])
+    user_profile["address"] = st.text_input("Current Address", user_profile["address"])
+    user_profile["gender"] = st.multiselect(
+            "Gender",
+            ["Male", "Female", "Divers"]
+        )    
+    user_profile["age"] = st.selectbox("Age", range(18, 101),
+        index=(user_profile["age"] - 18) if isinstance(user_profile["age"], int) else 0
+    )
+    user_profile["job"] = st.selectbox(
+        "Are you a student or a professional?",
+        ["", "Student", "Professional"],
+        index=["", "Student", "Professional"].index(user_profile["job"]) if user_profile["job"] in ["", "Student", "Professional"] else 0,
+    ) 
+    user_profile["monthly_income"] = st.number_input("Monthly Income (€)", min_value=0, value=int(user_profile.get("monthly_income", 0)))
+
+    # Save button
+    if st.button("Save Profile"):
+        get_storage().profiles.save(st.session_state["profile_id"], user_profile)
+        st.success("Profile updated successfully!")
+        st.session_state["user_profile"] = user_profile
+
+    if st.button("Open Chat"):
+        set_page("Chat")
+
+    # Button for landlords to offer a house
+    if st.button("Offer a House"):
+        st.session_state["current_page"] = "Offer a House"
+        st.rerun()
+
+    # Back button
+    if st.button("Back to Home"):
+        st.session_state["current_page"] = "Home"
+        st.rerun()
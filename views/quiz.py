@@ -0,0 +1,13 @@
+import streamlit as st
+
+# Quiz
+def quiz():
+    st.header("Gamified Financial Education Quiz")
+    st.session_state["step"] = 1
+    st.session_state["user_type"] = None
+    question = st.radio("What is the maximum rental deposit allowed by German law?", ["2 months", "3 months", "4 months"])
+    if st.button("Submit Answer"):
+        if question == "3 months":
+            st.success("Correct!")
+        else:
+            st.error("Wrong answer. The correct answer is '3 months.'")
@@ -0,0 +1,27 @@
+import pandas as pd
+import streamlit as st
+from sklearn.metrics.pairwise import cosine_similarity
+
+# Smart Recommendations
+def smart_recommendations():
+    st.header("AI-Based Shared Housing Matching")
+    st.session_state["step"] = 1
+    st.session_state["user_type"] = None
+    # Dummy preferences data
+    preferences = pd.DataFrame({
+        'Quiet': [1, 0, 1],
+        'Social': [0, 1, 1],
+        'Pets': [1, 1, 0]
+    }, index=["User A", "User B", "User C"])
+
+    # Collect user input
+    st.write("Answer a few questions to find the best match:")
+    quiet = st.radio("Are you quiet?", [1, 0])
+    social = st.radio("Are you social?", [1, 0])
+    pets = st.radio("Do you like pets?", [1, 0])
+
+    # AI Recommendation
+    user_vector = [[quiet, social, pets]]
+    similarities = cosine_similarity(user_vector, preferences.values)
+    match_index = similarities[0].argmax()
+    st.write(f"Best Match: {preferences.index[match_index]}")